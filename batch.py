@@ -0,0 +1,466 @@
+"""Command-line batch mode for the equivalency calculations
+
+Run with:
+    python batch.py csv [INPUT ...] [-o OUTPUT] [--targets 20,42,46,54]
+                        [--chunk-size N]
+    python batch.py ndjson [--targets 20,42,46,54] [--max-batch N]
+                           [--max-delay MS]
+    python batch.py table OUTPUT.{arrow,parquet,npy}
+    python batch.py memmap INPUT OUTPUT.npy [--raw-dtype float32]
+                           [--targets 42,46] [--chunk-size N]
+                           [--checkpoint-interval S | --no-checkpoint]
+
+Input CSV files need a header with player, speed (mph) and distance (ft)
+columns; other columns are ignored. Rows are read in fixed-size chunks,
+validated and computed with the vectorized utils kernels, and written out
+before the next chunk is read, so memory stays flat however large the input
+is. Each output row carries the reaction time and the equivalent speed at
+every target distance; invalid rows get an error message instead. Throughput
+is reported on stderr. An output path ending in .arrow/.feather, .parquet or
+.npy writes a columnar file instead of CSV (see export.py).
+
+The ndjson mode is a stdin/stdout filter for log pipelines. Each input line
+is a JSON object such as {"id": 7, "speed": 60, "distance": 46} with an
+optional "targets" list overriding --targets; each output line is the
+matching result, in input order, and blank lines are skipped. Lines are
+micro-batched into vectorized calls and a batch is flushed once it reaches
+--max-batch lines or its oldest line has waited --max-delay milliseconds,
+whichever comes first.
+
+The table mode writes the complete slider-domain equivalency table in long
+format (speed, distance, target_distance, reaction_time, equivalent_speed).
+
+The memmap mode handles pitch datasets larger than memory: input and output
+are memory-mapped and processed chunk by chunk (see outofcore.py). It
+checkpoints periodically, and rerunning an interrupted job resumes it.
+"""
+import argparse
+import contextlib
+import csv
+import json
+import math
+import numbers
+import queue
+import sys
+import threading
+import time
+
+import numpy as np
+
+from build_tables import build_tables
+from export import FORMATS, ColumnarWriter, write_columns
+import outofcore
+from utils import (PRESET_DISTANCES, EquivalencyWorkspace,
+                   calculate_equivalent_speeds, calculate_reaction_time,
+                   error_messages, generate_distance_range,
+                   load_equivalency_tables, table_speeds, validate_arrays)
+
+CHUNK_SIZE = 65_536
+
+# NDJSON error for ids that can't be written back as JSON
+INVALID_ID = "Request id must not contain NaN or Infinity"
+
+# NDJSON micro-batching thresholds
+MAX_BATCH = 1024
+MAX_DELAY_MS = 5.0
+
+# Error for inputs whose results overflow a float, and its CSV error code
+# (validate_arrays codes use the lower bits)
+RESULT_OUT_OF_RANGE = "Result is out of range"
+OUT_OF_RANGE_CODE = 4
+
+
+def parse_floats(values):
+    """Convert a list of strings to a float array, with NaN for unparseable values"""
+    try:
+        return np.array(values, dtype=float)
+    except ValueError:
+        out = np.empty(len(values))
+        for i, value in enumerate(values):
+            try:
+                out[i] = float(value)
+            except ValueError:
+                out[i] = np.nan
+        return out
+
+
+def open_input(path):
+    if path == "-":
+        return contextlib.nullcontext(sys.stdin)
+    return open(path, newline="")
+
+
+def open_output(path):
+    if path == "-":
+        return contextlib.nullcontext(sys.stdout)
+    return open(path, "w", newline="")
+
+
+def parse_targets(text):
+    """Parse comma-separated target distances, dropping repeats
+
+    Repeats are matched on their output column, so 42 and 42.0 are one
+    target.
+    """
+    targets = {}
+    for value in text.split(","):
+        if not value.strip():
+            continue
+        try:
+            target = float(value)
+        except ValueError:
+            target = math.nan
+        if not math.isfinite(target):
+            raise argparse.ArgumentTypeError(f"invalid target distance {value.strip()!r}")
+        targets.setdefault(target_column(target), target)
+    return list(targets.values())
+
+
+def compute_chunk(workspace, speeds, distances):
+    """Validate and compute one chunk
+
+    Returns (valid, codes, reaction_times, equivalent_speeds); the last two are
+    views of the workspace buffers and are overwritten by the next chunk.
+    Valid rows whose results overflow get OUT_OF_RANGE_CODE.
+    """
+    valid, codes = validate_arrays(speeds, distances)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        times, speeds_out = workspace.evaluate_batch(speeds, distances)
+    overflow = valid & ~(np.isfinite(times) & np.isfinite(speeds_out).all(axis=1))
+    if overflow.any():
+        valid = valid & ~overflow
+        codes = np.where(overflow, np.uint8(OUT_OF_RANGE_CODE), codes)
+    return valid, codes, times, speeds_out
+
+
+def read_csv_chunks(file, chunk_size):
+    """Yield (players, speeds, distances) text columns for successive chunks of a CSV file"""
+    reader = csv.reader(file)
+    header = [name.strip().lower() for name in next(reader, [])]
+    try:
+        columns = [header.index(name) for name in ("player", "speed", "distance")]
+    except ValueError:
+        raise ValueError("CSV input needs player, speed and distance columns")
+    width = max(columns) + 1
+
+    players, speeds, distances = [], [], []
+    for row in reader:
+        if not row:
+            continue
+        row += [""] * (width - len(row))
+        players.append(row[columns[0]])
+        speeds.append(row[columns[1]])
+        distances.append(row[columns[2]])
+        if len(players) == chunk_size:
+            yield players, speeds, distances
+            players, speeds, distances = [], [], []
+    if players:
+        yield players, speeds, distances
+
+
+def format_column(values, valid, fmt):
+    """Format a float column, leaving invalid rows blank"""
+    return np.where(valid, np.char.mod(fmt, values), "")
+
+
+def iter_csv_results(inputs, workspace, chunk_size):
+    """Yield (players, speed_text, distance_text, speeds, distances, valid, codes,
+    times, speeds_out) per chunk; speeds and distances are the parsed columns"""
+    for path in inputs:
+        with open_input(path) as file:
+            for players, speed_text, distance_text in read_csv_chunks(file, chunk_size):
+                speeds, distances = parse_floats(speed_text), parse_floats(distance_text)
+                yield ((players, speed_text, distance_text, speeds, distances)
+                       + compute_chunk(workspace, speeds, distances))
+
+
+def positive_int(text):
+    """argparse type for chunk and batch sizes"""
+    try:
+        value = int(text)
+    except ValueError:
+        value = 0
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {text!r}")
+    return value
+
+
+def target_column(target):
+    return f"speed_at_{target:g}ft"
+
+
+def run_csv(inputs, output, targets, chunk_size):
+    """Stream CSV inputs to CSV output; returns the number of rows processed"""
+    workspace = EquivalencyWorkspace(targets, capacity=chunk_size)
+    messages = {code: "; ".join(error_messages(code)) for code in range(4)}
+    messages[OUT_OF_RANGE_CODE] = RESULT_OUT_OF_RANGE
+    writer = csv.writer(output)
+    writer.writerow(["player", "speed", "distance", "reaction_time"]
+                    + [target_column(target) for target in targets]
+                    + ["error"])
+
+    rows = 0
+    for (players, speed_text, distance_text, _, _, valid, codes, times,
+         speeds_out) in iter_csv_results(inputs, workspace, chunk_size):
+        columns = [players, speed_text, distance_text,
+                   format_column(times, valid, "%.4f")]
+        columns += [format_column(speeds_out[:, j], valid, "%.2f")
+                    for j in range(len(targets))]
+        columns.append([messages[code] for code in codes])
+        writer.writerows(zip(*columns))
+        rows += len(players)
+    return rows
+
+
+def run_csv_columnar(inputs, path, targets, chunk_size):
+    """Stream CSV inputs to an Arrow, Parquet or .npy file; returns the row count
+
+    Invalid rows have NaN results and a non-zero error_code (see
+    utils.validate_arrays, or OUT_OF_RANGE_CODE when results overflow).
+    """
+    workspace = EquivalencyWorkspace(targets, capacity=chunk_size)
+    fields = ([("player", str), ("speed", np.float64), ("distance", np.float64),
+               ("reaction_time", np.float64)]
+              + [(target_column(target), np.float64) for target in targets]
+              + [("error_code", np.uint8)])
+    with ColumnarWriter(path, fields) as writer:
+        for (players, _, _, speeds, distances, valid, codes, times,
+             speeds_out) in iter_csv_results(inputs, workspace, chunk_size):
+            columns = {"player": players, "speed": speeds, "distance": distances,
+                       "reaction_time": np.where(valid, times, np.nan),
+                       "error_code": codes}
+            for j, target in enumerate(targets):
+                columns[target_column(target)] = np.where(valid, speeds_out[:, j],
+                                                          np.nan)
+            writer.write(columns)
+        return writer.rows
+
+
+def domain_columns():
+    """Long-format columns for every slider (speed, distance) and target distance"""
+    tables = load_equivalency_tables()
+    reaction_times, equivalent_speeds = tables if tables else build_tables()
+    speeds, distances = table_speeds(), generate_distance_range()
+    n = distances.size
+    return {
+        "speed": np.repeat(speeds, n * n),
+        "distance": np.tile(np.repeat(distances, n), speeds.size),
+        "target_distance": np.tile(distances, speeds.size * n),
+        "reaction_time": np.repeat(np.asarray(reaction_times).ravel(), n),
+        "equivalent_speed": np.asarray(equivalent_speeds).ravel(),
+    }
+
+
+def _number(value):
+    if isinstance(value, numbers.Real) and not isinstance(value, bool):
+        try:
+            value = float(value)
+        except OverflowError:
+            return np.nan
+        if math.isfinite(value):
+            return value
+    return np.nan
+
+
+def _target_key(targets):
+    """Targets as a tuple of floats, or None unless a list of finite numbers"""
+    if not isinstance(targets, list):
+        return None
+    key = tuple(_number(target) for target in targets)
+    return None if any(math.isnan(target) for target in key) else key
+
+
+def process_requests(requests, default_targets):
+    """Compute one result dict per parsed request, in order
+
+    Requests that are not JSON objects (None for unparseable lines) get an
+    error result, and so do inputs whose results overflow. Reaction times
+    for the whole batch come from one call, and equivalent speeds from one
+    call per distinct target list.
+    """
+    results = [{"errors": ["Request must be a JSON object"]}] * len(requests)
+    rows = [i for i, request in enumerate(requests) if isinstance(request, dict)]
+    if not rows:
+        return results
+
+    speeds = np.array([_number(requests[i].get("speed")) for i in rows])
+    distances = np.array([_number(requests[i].get("distance")) for i in rows])
+    valid, codes = validate_arrays(speeds, distances)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        times = calculate_reaction_time(speeds, distances)
+
+    groups = {}
+    for k, i in enumerate(rows):
+        request = requests[i]
+        result = {"id": request["id"]} if "id" in request else {}
+        results[i] = result
+        if not valid[k]:
+            result["errors"] = error_messages(codes[k])
+            continue
+        key = _target_key(request.get("targets", list(default_targets)))
+        if key is None:
+            result["errors"] = ["Targets must be a list of distances"]
+            continue
+        groups.setdefault(key, []).append(k)
+
+    for key, members in groups.items():
+        members = np.array(members)
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            matrix = calculate_equivalent_speeds(times[members, np.newaxis],
+                                                 np.array(key))
+        for k, row in zip(members, matrix):
+            result = results[rows[k]]
+            if not (math.isfinite(times[k]) and np.isfinite(row).all()):
+                result["errors"] = [RESULT_OUT_OF_RANGE]
+                continue
+            result["reaction_time"] = float(times[k])
+            result["equivalent_speeds"] = dict(zip((f"{t:g}" for t in key),
+                                                   row.tolist()))
+    return results
+
+
+def encode_result(result):
+    """One NDJSON output line
+
+    A result that can't be written as strict JSON (an id holding NaN or
+    Infinity) becomes an error line without the id.
+    """
+    try:
+        return json.dumps(result, allow_nan=False) + "\n"
+    except ValueError:
+        return json.dumps({"errors": [INVALID_ID]}) + "\n"
+
+
+def _read_lines(file, lines):
+    for line in file:
+        if line.strip():
+            lines.put(line)
+    lines.put(None)
+
+
+def run_ndjson(input_file, output, targets, max_batch, max_delay):
+    """Filter NDJSON requests to NDJSON results; returns the number of lines"""
+    lines = queue.Queue(maxsize=4 * max_batch)
+    threading.Thread(target=_read_lines, args=(input_file, lines),
+                     daemon=True).start()
+
+    count = 0
+    finished = False
+    while not finished:
+        line = lines.get()
+        if line is None:
+            break
+        batch = [line]
+        deadline = time.monotonic() + max_delay
+        while len(batch) < max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                line = lines.get(timeout=remaining) if remaining > 0 else lines.get_nowait()
+            except queue.Empty:
+                break
+            if line is None:
+                finished = True
+                break
+            batch.append(line)
+
+        requests = []
+        for text in batch:
+            try:
+                requests.append(json.loads(text))
+            except ValueError:
+                requests.append(None)
+        results = process_requests(requests, targets)
+        output.write("".join(encode_result(result) for result in results))
+        output.flush()
+        count += len(batch)
+    return count
+
+
+def run_command(args):
+    """Run the parsed subcommand; returns the number of rows processed"""
+    if args.command == "csv":
+        if args.output.endswith(tuple(FORMATS)):
+            rows = run_csv_columnar(args.inputs, args.output, args.targets,
+                                    args.chunk_size)
+        else:
+            with open_output(args.output) as output:
+                rows = run_csv(args.inputs, output, args.targets, args.chunk_size)
+    elif args.command == "memmap":
+        rows = outofcore.run_memmap(
+            args.input, args.output, args.targets, args.chunk_size,
+            args.raw_dtype,
+            None if args.no_checkpoint else args.checkpoint_interval)
+    elif args.command == "table":
+        columns = domain_columns()
+        write_columns(args.output, columns)
+        rows = columns["speed"].size
+    else:
+        rows = run_ndjson(sys.stdin, sys.stdout, args.targets, args.max_batch,
+                          args.max_delay / 1e3)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    csv_parser = commands.add_parser("csv", help="process CSV roster/session files")
+    csv_parser.add_argument("inputs", nargs="*", default=["-"],
+                            help="input CSV files ('-' for stdin, the default)")
+    csv_parser.add_argument("-o", "--output", default="-",
+                            help="output file ('-' for CSV on stdout, the "
+                                 "default); " + "/".join(FORMATS)
+                                 + " extensions write columnar files")
+    csv_parser.add_argument("--targets", type=parse_targets,
+                            default=list(PRESET_DISTANCES),
+                            help="comma-separated target distances in feet "
+                                 "(default: the preset distances)")
+    csv_parser.add_argument("--chunk-size", type=positive_int, default=CHUNK_SIZE)
+
+    ndjson_parser = commands.add_parser("ndjson", help="NDJSON stdin/stdout filter")
+    ndjson_parser.add_argument("--targets", type=parse_targets,
+                               default=list(PRESET_DISTANCES),
+                               help="comma-separated default target distances")
+    ndjson_parser.add_argument("--max-batch", type=positive_int, default=MAX_BATCH,
+                               help="flush after this many lines")
+    ndjson_parser.add_argument("--max-delay", type=float, default=MAX_DELAY_MS,
+                               help="flush after the oldest line has waited "
+                                    "this many milliseconds")
+
+    table_parser = commands.add_parser(
+        "table", help="export the full slider-domain equivalency table")
+    table_parser.add_argument("output", help="output file (" + "/".join(FORMATS) + ")")
+
+    memmap_parser = commands.add_parser(
+        "memmap", help="out-of-core processing of large binary/.npy pitch files")
+    memmap_parser.add_argument("input", help=".npy file, or flat binary with --raw-dtype")
+    memmap_parser.add_argument("output", help="output .npy file")
+    memmap_parser.add_argument("--raw-dtype",
+                               help="treat input as flat interleaved (speed, "
+                                    "distance) pairs of this dtype")
+    memmap_parser.add_argument("--targets", type=parse_targets,
+                               default=list(PRESET_DISTANCES),
+                               help="comma-separated target distances in feet")
+    memmap_parser.add_argument("--chunk-size", type=positive_int,
+                               default=outofcore.CHUNK_SIZE)
+    memmap_parser.add_argument("--checkpoint-interval", type=float,
+                               default=outofcore.CHECKPOINT_INTERVAL,
+                               help="seconds between checkpoints (default "
+                                    "%(default)s); rerunning an interrupted "
+                                    "job resumes from the last one")
+    memmap_parser.add_argument("--no-checkpoint", action="store_true",
+                               help="disable checkpointing and resuming")
+
+    args = parser.parse_args()
+    start = time.perf_counter()
+    try:
+        rows = run_command(args)
+    except (OSError, ValueError) as e:
+        parser.exit(2, f"{parser.prog}: error: {e}\n")
+    elapsed = time.perf_counter() - start
+    print(f"{rows} rows in {elapsed:.2f} s ({rows / max(elapsed, 1e-9):,.0f} rows/s)",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
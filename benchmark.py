@@ -0,0 +1,535 @@
+"""Benchmarks for the equivalency calculations in utils.py
+
+Run with:
+    python benchmark.py kernels [--pitchers N] [--repeat R]
+    python benchmark.py engines [--workloads ...] [--engines ...]
+                                [--output results.json] [--baseline old.json]
+    python benchmark.py parallel [--rows N] [--workers 1 2 4 ...]
+    python benchmark.py checkpoint [--rows N] [--chunk-size N]
+    python benchmark.py figures [--repeat R]
+
+`kernels` times the batched kernels against per-item loops. `engines` runs
+every flight time engine over the standard workloads and reports throughput,
+p50/p99 latency, peak memory and max error against the drag integrator, and
+can write the results as JSON to compare against a previous run.
+`parallel` reports the scaling efficiency of the sharded process-pool
+engine per worker count, `checkpoint` the throughput cost of
+checkpointing out-of-core runs, and `figures` the chart build time of the
+figures.py template builder against building a go.Figure from scratch, plus
+the size and build time of the animated figures with precomputed frames
+and the chart payload as JSON lists vs binary typed arrays.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from drag import calculate_flight_time
+from drag_table import calculate_table_flight_time, default_table
+import figures
+import outofcore
+from parallel import ParallelEngine
+from solver import solve_speeds
+from utils import (PRESET_DISTANCES, EquivalencyWorkspace, calculate_reaction_time,
+                   calculate_equivalent_speeds, calculate_equivalency_matrix,
+                   calculate_surrogate_flight_time, equivalent_speed,
+                   generate_distance_range, get_distance_grid, get_distance_points,
+                   reaction_time)
+
+# Engines that compute flight time for (speed, distance) arrays
+ENGINES = {
+    "closed_form": calculate_reaction_time,
+    "drag_rk4": calculate_flight_time,
+    "drag_table": calculate_table_flight_time,
+    "drag_surrogate": calculate_surrogate_flight_time,
+}
+
+# Workload name -> (rows, timed repeats)
+WORKLOADS = {
+    "ui_rerun": (1, 1000),
+    "grid": (92, 200),
+    "roster": (10_000, 20),
+    "pitch_log": (10_000_000, 3),
+}
+
+# Large workloads are fed to engines in chunks, as the batch tools do
+CHUNK_ROWS = 1_000_000
+
+# Rows checked against the reference for max error
+ERROR_SAMPLE = 100_000
+
+
+def best_time(func, repeat):
+    """Return the fastest of `repeat` timed calls to func, in seconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def make_roster(count, seed=0):
+    """Random (speed, distance) pairs within the slider domain"""
+    rng = np.random.default_rng(seed)
+    speeds = rng.integers(20, 111, count).astype(float)
+    distances = rng.integers(30, 122, count) * 0.5
+    return speeds, distances
+
+
+def bench_batch(pitchers, repeat):
+    """Per-pair Python loop vs one broadcast call to calculate_equivalency_matrix"""
+    speeds, distances = make_roster(pitchers)
+    targets = generate_distance_range()
+
+    def loop():
+        return np.array([
+            calculate_equivalent_speeds(calculate_reaction_time(s, d), targets)
+            for s, d in zip(speeds, distances)
+        ])
+
+    out = np.empty((pitchers, targets.size))
+    times_out = np.empty(pitchers)
+
+    def batched():
+        return calculate_equivalency_matrix(speeds, distances, targets,
+                                            out=out, times_out=times_out)
+
+    if not np.array_equal(loop(), batched()):
+        raise AssertionError("batched result differs from per-pair loop")
+
+    loop_time = best_time(loop, repeat)
+    batch_time = best_time(batched, repeat)
+    print(f"{pitchers} pitchers x {targets.size} distances")
+    print(f"  per-pair loop: {loop_time * 1e3:9.3f} ms")
+    print(f"  batched:       {batch_time * 1e3:9.3f} ms")
+    print(f"  speedup:       {loop_time / batch_time:9.1f}x")
+
+
+def bench_drag_inverse(repeat):
+    """Scalar root find per grid distance vs one batched solve_speeds call"""
+    targets = generate_distance_range()
+    target_time = calculate_flight_time(60, 46.0)
+
+    def loop():
+        return np.array([
+            solve_speeds(calculate_flight_time, target_time, d).speeds
+            for d in targets
+        ])
+
+    def batched():
+        return solve_speeds(calculate_flight_time, target_time, targets)
+
+    result = batched()
+    if not result.converged.all():
+        raise AssertionError("batched drag inverse did not converge")
+
+    loop_time = best_time(loop, repeat)
+    batch_time = best_time(batched, repeat)
+    print(f"Drag inverse over {targets.size} distances "
+          f"({result.iterations.max()} iterations)")
+    print(f"  scalar per distance: {loop_time * 1e3:9.3f} ms")
+    print(f"  batched:             {batch_time * 1e3:9.3f} ms")
+    print(f"  speedup:             {loop_time / batch_time:9.1f}x")
+
+
+def bench_workspace(queries):
+    """Fresh arrays per query vs an EquivalencyWorkspace reusing its buffers"""
+    speeds, distances = make_roster(queries)
+    workspace = EquivalencyWorkspace()
+
+    def fresh():
+        for s, d in zip(speeds, distances):
+            calculate_equivalent_speeds(calculate_reaction_time(s, d),
+                                        generate_distance_range())
+
+    def reused():
+        for s, d in zip(speeds, distances):
+            workspace.evaluate(s, d)
+
+    print(f"{queries} single queries over the {workspace.distances.size}-point grid")
+    for label, func in (("fresh arrays:", fresh), ("workspace:   ", reused)):
+        elapsed = best_time(func, 3)
+        tracemalloc.start()
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"  {label} {elapsed / queries * 1e6:7.2f} us/query, "
+              f"peak traced {peak} bytes")
+
+
+def bench_scalar(calls):
+    """Per-call cost of single-value queries: array wrapping vs the scalar fast path"""
+    target_time = calculate_reaction_time(60, 46.0)
+    numpy_time = np.float64(target_time)
+
+    cases = (
+        ("array wrap/unwrap:", lambda: calculate_equivalent_speeds(
+            target_time, np.array([42.0]))[0]),
+        ("fast path, float: ", lambda: equivalent_speed(target_time, 42.0)),
+        ("fast path, numpy:", lambda: equivalent_speed(numpy_time,
+                                                       np.float64(42.0))),
+        ("reaction_time:    ", lambda: reaction_time(60, 46.0)),
+    )
+    if equivalent_speed(target_time, 42.0) != cases[0][1]():
+        raise AssertionError("scalar fast path differs from array result")
+
+    print(f"Single-value queries ({calls} calls)")
+    for label, func in cases:
+        def loop():
+            for _ in range(calls):
+                func()
+        print(f"  {label} {best_time(loop, 3) / calls * 1e9:8.1f} ns/call")
+
+
+def make_workload(name):
+    """(speeds, distances) arrays for a named workload"""
+    rows = WORKLOADS[name][0]
+    if name == "ui_rerun":
+        return np.array([60.0]), np.array([46.0])
+    if name == "grid":
+        distances = generate_distance_range()
+        return np.full(distances.size, 60.0), distances
+    return make_roster(rows)
+
+
+def run_chunked(engine, speeds, distances):
+    """Call engine over CHUNK_ROWS-sized slices, writing into one output array"""
+    if speeds.size <= CHUNK_ROWS:
+        return engine(speeds, distances)
+    out = np.empty(speeds.size)
+    for start in range(0, speeds.size, CHUNK_ROWS):
+        stop = start + CHUNK_ROWS
+        out[start:stop] = engine(speeds[start:stop], distances[start:stop])
+    return out
+
+
+def bench_engine(engine, speeds, distances, repeat):
+    """Latencies (seconds) of repeated calls, and peak traced memory (bytes)"""
+    run_chunked(engine, speeds, distances)  # warm up lazily built tables
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run_chunked(engine, speeds, distances)
+        latencies.append(time.perf_counter() - start)
+
+    # Separate pass so tracing overhead doesn't skew the timings
+    tracemalloc.start()
+    run_chunked(engine, speeds, distances)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return np.array(latencies), peak
+
+
+def bench_engines(engine_names, workload_names):
+    """Run every engine over every workload and return a list of result dicts"""
+    default_table()
+    results = []
+    for workload in workload_names:
+        speeds, distances = make_workload(workload)
+        sample = slice(0, ERROR_SAMPLE)
+        reference = calculate_flight_time(speeds[sample], distances[sample],
+                                          steps=400)
+        repeat = WORKLOADS[workload][1]
+        for name in engine_names:
+            engine = ENGINES[name]
+            latencies, peak = bench_engine(engine, speeds, distances, repeat)
+            error = np.abs(engine(speeds[sample], distances[sample]) - reference)
+            p50, p99 = np.percentile(latencies, [50, 99])
+            result = {
+                "engine": name,
+                "workload": workload,
+                "rows": int(speeds.size),
+                "repeat": repeat,
+                "throughput_rows_per_s": speeds.size / p50,
+                "p50_ms": p50 * 1e3,
+                "p99_ms": p99 * 1e3,
+                "peak_memory_mb": peak / 1e6,
+                "max_error_s": float(error.max()),
+            }
+            results.append(result)
+            print(f"{workload:>10} {name:>15}: {result['throughput_rows_per_s']:12.4g} rows/s"
+                  f"  p50 {result['p50_ms']:9.3f} ms  p99 {result['p99_ms']:9.3f} ms"
+                  f"  peak {result['peak_memory_mb']:8.1f} MB"
+                  f"  max err {result['max_error_s']:.1e} s")
+    return results
+
+
+def bench_parallel(rows, worker_counts, repeat):
+    """Serial kernels vs ParallelEngine at each worker count"""
+    speeds, distances = make_roster(rows)
+    targets = generate_distance_range()[::10]
+
+    def serial():
+        return calculate_equivalency_matrix(speeds, distances, targets)
+
+    expected = serial()
+    serial_time = best_time(serial, repeat)
+    print(f"{rows} rows x {targets.size} targets, serial: {serial_time * 1e3:9.1f} ms")
+    for workers in worker_counts:
+        with ParallelEngine(workers) as engine:
+            with engine.run(speeds, distances, targets) as result:
+                if not np.array_equal(result.equivalent_speeds, expected):
+                    raise AssertionError("parallel result differs from serial run")
+            elapsed = best_time(
+                lambda: engine.run(speeds, distances, targets).close(), repeat)
+        speedup = serial_time / elapsed
+        print(f"  {workers:3d} workers: {elapsed * 1e3:9.1f} ms  "
+              f"speedup {speedup:5.2f}x  efficiency {speedup / workers:6.1%}")
+
+
+def bench_checkpoint(rows, chunk_size, repeat):
+    """Out-of-core throughput without checkpoints, at the default interval and every chunk"""
+    speeds, distances = make_roster(rows)
+    with tempfile.TemporaryDirectory() as directory:
+        input_path = os.path.join(directory, "pitches.npy")
+        output_path = os.path.join(directory, "out.npy")
+        np.save(input_path, np.column_stack([speeds, distances]))
+
+        def run(interval):
+            start = time.perf_counter()
+            outofcore.run_memmap(input_path, output_path, PRESET_DISTANCES,
+                                 chunk_size, checkpoint_interval=interval)
+            return time.perf_counter() - start
+
+        # Interleave the variants so page-cache writeback from one run
+        # doesn't consistently land on the next
+        variants = {"no checkpoints:": None,
+                    f"every {outofcore.CHECKPOINT_INTERVAL:g} s:":
+                        outofcore.CHECKPOINT_INTERVAL,
+                    "every second:": 1.0,
+                    "every chunk:": 0.0}
+        best = dict.fromkeys(variants, float("inf"))
+        for _ in range(repeat):
+            for label, interval in variants.items():
+                best[label] = min(best[label], run(interval))
+
+    baseline = best["no checkpoints:"]
+    print(f"{rows} rows in {chunk_size}-row chunks")
+    for label, elapsed in best.items():
+        print(f"  {label:16} {rows / elapsed:12,.0f} rows/s  "
+              f"overhead {elapsed / baseline - 1:+6.1%}")
+
+
+def scratch_figure(speed, distance, distances, equiv_speeds, reference_speeds):
+    """The chart built from scratch with add_trace/add_vline, as main.py used to"""
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=distances, y=equiv_speeds, mode='lines',
+                             name='Eqv. MPH', line=dict(color='#1f77b4', width=3)))
+    fig.add_trace(go.Scatter(x=[distance], y=[speed], mode='markers+text',
+                             name='Your Input', text=[f"{speed} mph"],
+                             textposition="top center",
+                             marker=dict(color='#ff4b4b', size=15, symbol='star',
+                                         line=dict(color='black', width=2))))
+    for dist, name, equiv_speed in zip(get_distance_points(), figures.REFERENCE_NAMES,
+                                       reference_speeds):
+        if dist != distance:
+            fig.add_vline(x=dist, line_dash="dot", line_color="gray", opacity=0.5)
+            fig.add_trace(go.Scatter(x=[dist], y=[equiv_speed], mode='markers+text',
+                                     name=name, text=[f"{equiv_speed:.1f} mph"],
+                                     textposition="top center",
+                                     marker=dict(size=8, symbol='circle'),
+                                     showlegend=True))
+    fig.update_layout(title=dict(text=f"Equivalent Speeds for {speed} mph at {distance} ft",
+                                 x=0.5, xanchor='center'),
+                      xaxis_title="Release Distance (feet)", yaxis_title="Speed (mph)",
+                      hovermode='x unified', showlegend=False,
+                      legend=dict(yanchor="bottom", orientation="h", y=-0.30,
+                                  xanchor="center", x=0.5),
+                      margin=dict(l=50, r=50, t=80, b=50))
+    fig.add_vline(x=distance, line_dash="dot", line_color="red", opacity=0.5)
+    fig.update_xaxes(range=[15, 62], dtick=5, gridcolor='lightgray')
+    fig.update_yaxes(gridcolor='lightgray')
+    return fig
+
+
+def decode_arrays(value):
+    """Replace Plotly typed-array specs in a figure spec with plain lists"""
+    if isinstance(value, dict):
+        if set(value) == {"dtype", "bdata"}:
+            return figures.decode_typed_array(value).tolist()
+        return {key: decode_arrays(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [decode_arrays(item) for item in value]
+    return value
+
+
+def bench_figures(repeat):
+    """Chart build time: from scratch vs the template builder vs a raw dict
+
+    The builder's go.Figure is validated by Plotly, the raw dict is not; the
+    difference is the validation cost main.py pays once per cached input.
+    "+ spec" adds what st.plotly_chart does with the result before sending
+    it: to_dict() for a go.Figure, then JSON without validation.
+    """
+    speed, distance = 60, 46.0
+    reaction = calculate_reaction_time(speed, distance)
+    distances = generate_distance_range()
+    args = (speed, distance, distances, calculate_equivalent_speeds(reaction, distances),
+            calculate_equivalent_speeds(reaction, get_distance_points()))
+
+    def serialize(figure):
+        if isinstance(figure, go.Figure):
+            figure = figure.to_dict()
+        return pio.to_json(figure, validate=False)
+
+    builders = {"scratch go.Figure": scratch_figure,
+                "builder go.Figure": figures.build_figure,  # validated by Plotly
+                "builder raw dict": figures.figure_dict}
+    expected = decode_arrays(json.loads(serialize(scratch_figure(*args))))
+    figures.base_template()
+    print(f"Chart for {speed} mph at {distance} ft ({distances.size}-point curve)")
+    for label, builder in builders.items():
+        if builder is not scratch_figure:
+            # Compare full-precision values; float32 payloads are checked below
+            plain = go.Figure(builder(*args, binary=False))
+            if decode_arrays(json.loads(serialize(plain))) != expected:
+                raise AssertionError(f"{label} differs from the scratch figure")
+        build = best_time(lambda: builder(*args), repeat)
+        total = best_time(lambda: serialize(builder(*args)), repeat)
+        print(f"  {label:18} build {build * 1e3:8.3f} ms   + spec {total * 1e3:8.3f} ms")
+
+    for axis in figures.FRAME_AXES:
+        for budget in (figures.FRAME_BUDGET, figures.FRAME_BUDGET // 5):
+            def animate():
+                return figures.animated_figure_dict(speed, distance, axis, budget)
+            spec = animate()
+            size = len(pio.to_json(spec, validate=False))
+            build = best_time(animate, max(1, repeat // 20))
+            validate = best_time(lambda: go.Figure(spec), max(1, repeat // 20))
+            print(f"  {axis} frames, {budget / 1e3:.0f} KB budget: "
+                  f"{len(spec['frames'])} frames, spec {size / 1e3:.0f} KB, "
+                  f"build {build * 1e3:.1f} ms, validate {validate * 1e3:.1f} ms")
+
+    bench_payloads(repeat)
+
+
+def bench_payloads(repeat):
+    """Chart spec size and serialization time: JSON lists vs typed arrays
+
+    Times cover building the raw figure dict, encoding the curve and
+    serializing the spec, for the default grid and finer ones.
+    """
+    speed, distance = 60, 46.0
+    reaction = calculate_reaction_time(speed, distance)
+    references = calculate_equivalent_speeds(reaction, get_distance_points())
+
+    def encoded(distances, curve, dtype):
+        spec = figures.figure_dict(speed, distance, distances, curve, references,
+                                   binary=dtype != "json")
+        if dtype in ("f4", "f8"):
+            spec["data"][0] = dict(spec["data"][0],
+                                   x=figures.typed_array(distances, dtype),
+                                   y=figures.typed_array(curve, dtype))
+        return pio.to_json(spec, validate=False)
+
+    print("Chart spec payload (curve only differs):")
+    for step in (0.5, 0.1, 0.01):
+        distances = get_distance_grid(step=step)
+        curve = calculate_equivalent_speeds(reaction, distances)
+        baseline = len(encoded(distances, curve, "json"))
+        for label, dtype in (("JSON lists", "json"), ("typed f8", "f8"),
+                             ("typed f4", "f4"), ("typed auto", None)):
+            payload = encoded(distances, curve, dtype)
+            elapsed = best_time(lambda: encoded(distances, curve, dtype), repeat)
+            sent = json.loads(payload)["data"][0]["y"]
+            if isinstance(sent, dict):
+                error = np.abs(figures.decode_typed_array(sent) - curve).max()
+                sent_dtype = sent["dtype"]
+            else:
+                error = np.abs(np.array(sent) - curve).max()
+                sent_dtype = "json"
+            print(f"  {distances.size:5d} points {label:10} ({sent_dtype:>4}): "
+                  f"{len(payload) / 1e3:8.1f} KB ({len(payload) / baseline:6.1%})  "
+                  f"{elapsed * 1e3:7.3f} ms  max error {error:.1e} mph")
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                              capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare_to_baseline(results, path):
+    """Print p50 change per (engine, workload) against a previous JSON run"""
+    with open(path) as f:
+        baseline = {(r["engine"], r["workload"]): r for r in json.load(f)["results"]}
+    print(f"Change in p50 vs {path}:")
+    for result in results:
+        old = baseline.get((result["engine"], result["workload"]))
+        if old is not None:
+            change = result["p50_ms"] / old["p50_ms"] - 1.0
+            print(f"{result['workload']:>10} {result['engine']:>15}: {change:+7.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    kernels = commands.add_parser("kernels", help="batched kernels vs loops")
+    kernels.add_argument("--pitchers", type=int, default=10_000)
+    kernels.add_argument("--repeat", type=int, default=5)
+
+    engines = commands.add_parser("engines", help="flight time engine comparison")
+    engines.add_argument("--engines", nargs="+", choices=list(ENGINES),
+                         default=list(ENGINES))
+    engines.add_argument("--workloads", nargs="+", choices=list(WORKLOADS),
+                         default=list(WORKLOADS))
+    engines.add_argument("--output", help="write results as JSON to this path")
+    engines.add_argument("--baseline", help="previous JSON results to compare against")
+
+    parallel = commands.add_parser("parallel", help="sharded process pool scaling")
+    parallel.add_argument("--rows", type=int, default=10_000_000)
+    parallel.add_argument("--workers", type=int, nargs="+",
+                          default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    parallel.add_argument("--repeat", type=int, default=3)
+
+    checkpoint = commands.add_parser("checkpoint", help="checkpointing overhead")
+    checkpoint.add_argument("--rows", type=int, default=20_000_000)
+    checkpoint.add_argument("--chunk-size", type=int, default=outofcore.CHUNK_SIZE)
+    checkpoint.add_argument("--repeat", type=int, default=3)
+
+    figures_parser = commands.add_parser("figures", help="chart build time")
+    figures_parser.add_argument("--repeat", type=int, default=200)
+
+    args = parser.parse_args()
+    if args.command == "figures":
+        bench_figures(args.repeat)
+    elif args.command == "checkpoint":
+        bench_checkpoint(args.rows, args.chunk_size, args.repeat)
+    elif args.command == "parallel":
+        bench_parallel(args.rows, args.workers, args.repeat)
+    elif args.command == "kernels":
+        bench_batch(args.pitchers, args.repeat)
+        bench_drag_inverse(args.repeat)
+        bench_workspace(args.pitchers)
+        bench_scalar(args.pitchers)
+    else:
+        results = bench_engines(args.engines, args.workloads)
+        if args.baseline:
+            compare_to_baseline(results, args.baseline)
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump({
+                    "revision": git_revision(),
+                    "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                    "python": platform.python_version(),
+                    "numpy": np.__version__,
+                    "machine": platform.machine(),
+                    "results": results,
+                }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Precompute reaction-time and equivalent-speed tables for the slider domain
+
+Run with: python build_tables.py [output_dir]
+
+The tables are written as .npy files that utils.load_equivalency_tables
+memory-maps at runtime. Files are written to a temporary name and renamed
+into place so running workers never see a partial table.
+"""
+import os
+import sys
+
+import numpy as np
+
+from utils import (TABLE_DIR, REACTION_TIME_TABLE, EQUIVALENT_SPEED_TABLE,
+                   calculate_reaction_time, calculate_equivalency_matrix,
+                   generate_distance_range, table_speeds)
+
+
+def build_tables():
+    """Return (reaction_times, equivalent_speeds) for every slider combination"""
+    speeds = table_speeds()
+    distances = generate_distance_range()
+    reaction_times = calculate_reaction_time(speeds[:, np.newaxis], distances)
+
+    # One batched pass over all (speed, distance) pairs, row-major
+    pair_speeds, pair_distances = np.meshgrid(speeds, distances, indexing="ij")
+    equivalent_speeds = calculate_equivalency_matrix(pair_speeds.ravel(),
+                                                     pair_distances.ravel(),
+                                                     distances)
+    return reaction_times, equivalent_speeds.reshape(speeds.size, distances.size,
+                                                     distances.size)
+
+
+def save_table(directory, name, table):
+    """Atomically write one table as a .npy file"""
+    path = os.path.join(directory, name)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, np.ascontiguousarray(table))
+    os.replace(tmp_path, path)
+
+
+def main():
+    directory = sys.argv[1] if len(sys.argv) > 1 else TABLE_DIR
+    os.makedirs(directory, exist_ok=True)
+    reaction_times, equivalent_speeds = build_tables()
+    save_table(directory, REACTION_TIME_TABLE, reaction_times)
+    save_table(directory, EQUIVALENT_SPEED_TABLE, equivalent_speeds)
+    size = reaction_times.nbytes + equivalent_speeds.nbytes
+    print(f"Wrote {equivalent_speeds.shape} tables to {directory} "
+          f"({size / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
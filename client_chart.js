@@ -0,0 +1,92 @@
+// Equivalency chart computed in the browser; see client_chart.py.
+// The math mirrors utils.py operation for operation, so with IEEE doubles
+// on both sides the results are identical, and figureSpec mirrors
+// figures.figure_dict using the template exported from Python.
+"use strict";
+
+const MPH_TO_FT_PER_SEC = 1.467;
+
+function reactionTime(speed, distance) {
+  return distance / (speed * MPH_TO_FT_PER_SEC);
+}
+
+function equivalentSpeeds(targetTime, distances) {
+  return distances.map((d) => d / targetTime / MPH_TO_FT_PER_SEC);
+}
+
+// Python's str() of a float slider value: 46 -> "46.0", 46.5 -> "46.5"
+function formatFloat(x) {
+  return Number.isInteger(x) ? x.toFixed(1) : String(x);
+}
+
+// Python's format(x, ".1f"): exact ties (only x.25 and x.75 are exact in
+// binary) round to even, where toFixed rounds them up
+function formatTenths(x) {
+  if ((x * 4) % 2 === 1) {
+    const tenths = Math.floor(x * 10);
+    return ((tenths % 2 === 0 ? tenths : tenths + 1) / 10).toFixed(1);
+  }
+  return x.toFixed(1);
+}
+
+// Same text as the reaction time readout in main.py
+function reactionTimeText(time) {
+  return `⏱️ Reaction Time: ${time.toFixed(3)} seconds`;
+}
+
+function figureSpec(config, speed, distance) {
+  const time = reactionTime(speed, distance);
+  const { layout, traces, lines } = config.template;
+  const [curve, point, reference] = traces;
+  const [referenceLine, inputLine] = lines;
+  const data = [
+    { ...curve, x: config.distances, y: equivalentSpeeds(time, config.distances) },
+    { ...point, x: [distance], y: [speed], text: [`${speed} mph`] },
+  ];
+  const shapes = [];
+  const referenceSpeeds = equivalentSpeeds(time, config.presets);
+  config.presets.forEach((dist, i) => {
+    // Only mark a reference distance that differs from the input distance
+    if (dist !== distance) {
+      shapes.push({ ...referenceLine, x0: dist, x1: dist });
+      data.push({
+        ...reference,
+        x: [dist],
+        y: [referenceSpeeds[i]],
+        name: config.names[i],
+        text: [`${formatTenths(referenceSpeeds[i])} mph`],
+      });
+    }
+  });
+  shapes.push({ ...inputLine, x0: distance, x1: distance });
+  const title = {
+    ...layout.title,
+    text: `Equivalent Speeds for ${speed} mph at ${formatFloat(distance)} ft`,
+  };
+  return { reactionTime: time, data, layout: { ...layout, title, shapes } };
+}
+
+function mountChart(root, config) {
+  const speedInput = root.querySelector(".speed");
+  const distanceInput = root.querySelector(".distance");
+  const chart = root.querySelector(".chart");
+
+  function update() {
+    const speed = Number(speedInput.value);
+    const distance = Number(distanceInput.value);
+    root.querySelector(".speed-value").textContent = `${speed}`;
+    root.querySelector(".distance-value").textContent = formatFloat(distance);
+    const spec = figureSpec(config, speed, distance);
+    root.querySelector(".reaction-time").textContent = reactionTimeText(spec.reactionTime);
+    Plotly.react(chart, spec.data, spec.layout, { responsive: true });
+  }
+
+  speedInput.addEventListener("input", update);
+  distanceInput.addEventListener("input", update);
+  update();
+}
+
+if (typeof module !== "undefined") {
+  module.exports = { reactionTime, equivalentSpeeds, formatFloat, formatTenths, reactionTimeText,
+                     figureSpec };
+}
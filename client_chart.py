@@ -0,0 +1,170 @@
+"""Client-side equivalency chart that updates without Python reruns
+
+render_html returns a self-contained component (for
+st.components.v1.html) with its own speed and distance sliders. plotly.js
+comes from the installed plotly package: it is written once into static/
+and served by Streamlit's static file serving, so browsers cache it and no
+CDN is needed. The
+distance grid and the figure template from figures.py are sent once, and
+client_chart.js recomputes the curve, reference points and reaction time in
+the browser on every slider movement, so interactions cost the server
+nothing. Only the no-drag model is available client-side.
+
+Run with: python client_chart.py
+
+to check the JavaScript headlessly under node against utils and
+figures.figure_dict for every slider combination.
+"""
+import json
+import os
+import subprocess
+import sys
+from functools import lru_cache
+
+import numpy as np
+import plotly.offline
+
+from figures import REFERENCE_NAMES, base_template, figure_dict
+from utils import (DISTANCE_MAX, DISTANCE_MIN, DISTANCE_STEP, PRESET_DISTANCES,
+                   SPEED_MAX, SPEED_MIN, SPEED_STEP, calculate_equivalent_speeds,
+                   calculate_reaction_time, generate_distance_range, table_speeds)
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPT_PATH = os.path.join(APP_DIR, "client_chart.js")
+STATIC_DIR = os.path.join(APP_DIR, "static")
+
+# Named after the plotly.js version, so an upgrade isn't hidden by a cached copy
+PLOTLY_JS_NAME = f"plotly-{plotly.offline.get_plotlyjs_version()}.min.js"
+PLOTLY_JS_URL = "/app/static/" + PLOTLY_JS_NAME
+
+# Component height in pixels: controls, the default 450px chart and readout
+HEIGHT = 620
+
+
+@lru_cache(maxsize=1)
+def client_config():
+    """Everything the browser needs, as JSON: grid, presets and figure template"""
+    layout, traces, lines = base_template()
+    return json.dumps({
+        "distances": generate_distance_range().tolist(),
+        "presets": list(PRESET_DISTANCES),
+        "names": list(REFERENCE_NAMES),
+        "template": {"layout": layout, "traces": traces, "lines": lines},
+    })
+
+
+@lru_cache(maxsize=1)
+def write_plotly_script(directory=STATIC_DIR):
+    """Write the installed plotly.js into directory unless it is there; returns the path"""
+    path = os.path.join(directory, PLOTLY_JS_NAME)
+    if not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        # Write then rename, so a concurrent request never serves half a file
+        partial = f"{path}.{os.getpid()}.tmp"
+        with open(partial, "w", encoding="utf-8") as f:
+            f.write(plotly.offline.get_plotlyjs())
+        os.replace(partial, path)
+    return path
+
+
+@lru_cache(maxsize=1)
+def client_script():
+    with open(SCRIPT_PATH) as f:
+        return f.read()
+
+
+def _slider(name, label, low, high, step, value):
+    return (f'<label>{label} <b class="{name}-value"></b>'
+            f'<input class="{name}" type="range" min="{low}" max="{high}" '
+            f'step="{step}" value="{value}"></label>')
+
+
+def render_html(speed, distance):
+    """Component HTML, starting from the given slider values"""
+    write_plotly_script()
+    return f"""
+<div class="equivalency">
+  <style>
+    .equivalency {{ font-family: sans-serif; }}
+    .equivalency .controls {{ display: flex; gap: 2rem; }}
+    .equivalency label {{ flex: 1; }}
+    .equivalency input {{ width: 100%; }}
+  </style>
+  <div class="controls">
+    {_slider("speed", "Pitch Velo (mph)", SPEED_MIN, SPEED_MAX, SPEED_STEP, speed)}
+    {_slider("distance", "Release Distance (ft)", DISTANCE_MIN, DISTANCE_MAX,
+             DISTANCE_STEP, distance)}
+  </div>
+  <div class="chart"></div>
+  <p class="reaction-time"></p>
+</div>
+<script src="{PLOTLY_JS_URL}"></script>
+<script>{client_script()}</script>
+<script>
+  mountChart(document.querySelector(".equivalency"), {client_config()});
+</script>
+"""
+
+
+# Reads the config and [speed, distance] cases as JSON on stdin and writes
+# the reaction time, readout, data, title and shapes for each case
+NODE_HARNESS = """
+const { figureSpec, reactionTimeText } = require(process.argv[1]);
+let input = "";
+process.stdin.on("data", (chunk) => (input += chunk));
+process.stdin.on("end", () => {
+  const { config, cases } = JSON.parse(input);
+  const out = cases.map(([speed, distance]) => {
+    const spec = figureSpec(config, speed, distance);
+    return [spec.reactionTime, reactionTimeText(spec.reactionTime), spec.data,
+            spec.layout.title, spec.layout.shapes];
+  });
+  process.stdout.write(JSON.stringify(out));
+});
+"""
+
+
+def _plain(value):
+    """Round-trip through JSON so NumPy values compare like the node output"""
+    return json.loads(json.dumps(value, default=np.ndarray.tolist))
+
+
+def verify(node="node"):
+    """Compare client_chart.js with utils and figure_dict on the whole domain
+
+    Returns (cases checked, mismatching cases).
+    """
+    cases = [(int(speed), float(distance)) for speed in table_speeds()
+             for distance in generate_distance_range()]
+    request = json.dumps({"config": json.loads(client_config()), "cases": cases})
+    result = subprocess.run([node, "-e", NODE_HARNESS, SCRIPT_PATH], input=request,
+                            capture_output=True, text=True, check=True)
+    distances = generate_distance_range()
+    points = np.array(PRESET_DISTANCES)
+    mismatches = 0
+    for (speed, distance), (time, readout, data, title, shapes) in zip(
+            cases, json.loads(result.stdout)):
+        expected_time = calculate_reaction_time(speed, distance)
+        expected = _plain(figure_dict(speed, distance, distances,
+                                      calculate_equivalent_speeds(expected_time, distances),
+                                      calculate_equivalent_speeds(expected_time, points),
+                                      binary=False))
+        if (time != expected_time
+                or readout != f"⏱️ Reaction Time: {expected_time:.3f} seconds"
+                or data != expected["data"]
+                or title != expected["layout"]["title"]
+                or shapes != expected["layout"]["shapes"]):
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"mismatch at {speed} mph, {distance} ft", file=sys.stderr)
+    return len(cases), mismatches
+
+
+def main():
+    cases, mismatches = verify()
+    print(f"{cases} slider combinations checked under node, {mismatches} mismatches")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Micro-batching request coalescer for the equivalency service
+
+Concurrent single-item requests are collected for up to max_delay seconds
+or max_batch items, whichever comes first, computed with one broadcast call
+and the results scattered back to each caller. With many clients this turns
+thousands of tiny NumPy calls into a few large ones.
+
+A max_delay of 0 still coalesces: everything queued during the current
+event loop iteration is flushed together on the next one.
+"""
+import asyncio
+import time
+from collections import deque
+
+import numpy as np
+
+# Default batch window (seconds) and size
+MAX_DELAY = 200e-6
+MAX_BATCH = 1024
+
+# Queueing delays kept for the percentile metrics
+DELAY_SAMPLES = 10_000
+
+
+class CoalescerStats:
+    """Batch size and queueing delay metrics for a Coalescer"""
+
+    def __init__(self):
+        self.batches = 0
+        self.items = 0
+        self.max_batch_size = 0
+        # Batch count per power-of-two size bucket: 1, 2, 3-4, 5-8, ...
+        self.size_buckets = {}
+        self.delays = deque(maxlen=DELAY_SAMPLES)
+
+    def record(self, size, delays):
+        self.batches += 1
+        self.items += size
+        self.max_batch_size = max(self.max_batch_size, size)
+        bucket = 1 << (size - 1).bit_length()
+        self.size_buckets[bucket] = self.size_buckets.get(bucket, 0) + 1
+        self.delays.extend(delays)
+
+    def snapshot(self):
+        delays_us = np.array(self.delays) * 1e6
+        if delays_us.size:
+            queue_delay = {"p50": float(np.percentile(delays_us, 50)),
+                           "p99": float(np.percentile(delays_us, 99)),
+                           "max": float(delays_us.max())}
+        else:
+            queue_delay = {"p50": 0.0, "p99": 0.0, "max": 0.0}
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": self.items / self.batches if self.batches else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "batch_size_buckets": {f"<={size}": count
+                                   for size, count in sorted(self.size_buckets.items())},
+            "queue_delay_us": queue_delay,
+        }
+
+
+class Coalescer:
+    """Gather submitted items into batches for one vectorized compute call
+
+    compute takes a list of items and returns a list of results in the same
+    order. If it raises, every caller in that batch gets the exception.
+    Must be used from a single event loop.
+    """
+
+    def __init__(self, compute, max_delay=MAX_DELAY, max_batch=MAX_BATCH):
+        self.compute = compute
+        self.max_delay = max_delay
+        self.max_batch = max_batch
+        self.stats = CoalescerStats()
+        self._pending = []
+        self._timer = None
+
+    async def submit(self, item):
+        """Queue one item and wait for its result"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future, time.perf_counter()))
+        if len(self._pending) >= self.max_batch:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self.flush)
+        return await future
+
+    def flush(self):
+        """Compute everything queued so far"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        start = time.perf_counter()
+        self.stats.record(len(pending), [start - queued for _, _, queued in pending])
+        try:
+            results = self.compute([item for item, _, _ in pending])
+        except Exception as e:
+            for _, future, _ in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future, _), result in zip(pending, results):
+            # The caller may have gone away (e.g. the connection was dropped)
+            if not future.done():
+                future.set_result(result)
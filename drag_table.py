@@ -0,0 +1,166 @@
+"""Interpolation-table surrogate for the drag flight time model
+
+The table stores the drag model's flight time divided by the constant-speed
+flight time over a (release speed, distance) grid. That ratio is smooth and
+close to 1, so interpolating it is far more accurate than interpolating the
+flight time itself. Grids start uniform and are refined where the error
+against drag.calculate_flight_time, checked at cell midpoints, exceeds the
+requested bound.
+"""
+import warnings
+from functools import lru_cache
+
+import numpy as np
+
+from drag import calculate_flight_time
+from utils import (SPEED_MIN, SPEED_MAX, DISTANCE_MIN, DISTANCE_MAX,
+                   calculate_reaction_time)
+
+# Default error bound on flight time, in seconds
+ERROR_BOUND = 1e-8
+
+
+def _linear_weights(grid, x):
+    """Indices (n, 2) and weights (n, 2) for piecewise-linear interpolation"""
+    i = np.clip(np.searchsorted(grid, x, side="right") - 1, 0, grid.size - 2)
+    s = (x - grid[i]) / (grid[i + 1] - grid[i])
+    return np.stack([i, i + 1], axis=-1), np.stack([1.0 - s, s], axis=-1)
+
+
+def _hermite_weights(grid, x):
+    """Cell index (n,), value weights (n, 2) and slope weights (n, 2) for cubic Hermite"""
+    i = np.clip(np.searchsorted(grid, x, side="right") - 1, 0, grid.size - 2)
+    width = grid[i + 1] - grid[i]
+    s = (x - grid[i]) / width
+    s2, s3 = s * s, s * s * s
+    values = np.stack([2 * s3 - 3 * s2 + 1, 3 * s2 - 2 * s3], axis=-1)
+    slopes = np.stack([s3 - 2 * s2 + s, s3 - s2], axis=-1) * width[:, np.newaxis]
+    return i, values, slopes
+
+
+class FlightTimeTable:
+    """Flight time over a (speed, distance) grid with bilinear/bicubic lookup
+
+    Bicubic lookup is Hermite interpolation using node derivatives estimated
+    with second-order finite differences, which works on non-uniform grids.
+    """
+
+    def __init__(self, speeds, distances, method="cubic"):
+        if method not in ("linear", "cubic"):
+            raise ValueError("method must be 'linear' or 'cubic'")
+        self.speeds = np.asarray(speeds, dtype=float)
+        self.distances = np.asarray(distances, dtype=float)
+        self.method = method
+        s, d = np.meshgrid(self.speeds, self.distances, indexing="ij")
+        self.ratios = calculate_flight_time(s, d) / calculate_reaction_time(s, d)
+        if method == "cubic":
+            self.d_speed = np.gradient(self.ratios, self.speeds, axis=0,
+                                       edge_order=2)
+            self.d_distance = np.gradient(self.ratios, self.distances, axis=1,
+                                          edge_order=2)
+            self.d_cross = np.gradient(self.d_speed, self.distances, axis=1,
+                                       edge_order=2)
+        self.max_error = None
+
+    def calculate_flight_time(self, speed, distance):
+        """Interpolated flight time given speed (mph) and distance (ft)"""
+        speed, distance = np.broadcast_arrays(np.asarray(speed, dtype=float),
+                                              np.asarray(distance, dtype=float))
+        if self.method == "cubic":
+            ratio = self._bicubic(speed.ravel(), distance.ravel())
+        else:
+            si, sw = _linear_weights(self.speeds, speed.ravel())
+            di, dw = _linear_weights(self.distances, distance.ravel())
+            cells = self.ratios[si[:, :, np.newaxis], di[:, np.newaxis, :]]
+            ratio = np.einsum("ni,nj,nij->n", sw, dw, cells)
+        ratio = ratio.reshape(speed.shape)
+        times = ratio * calculate_reaction_time(speed, distance)
+        return float(times) if times.ndim == 0 else times
+
+    def _bicubic(self, speed, distance):
+        si, sv, ss = _hermite_weights(self.speeds, speed)
+        di, dv, ds = _hermite_weights(self.distances, distance)
+        rows = np.stack([si, si + 1], axis=-1)[:, :, np.newaxis]
+        cols = np.stack([di, di + 1], axis=-1)[:, np.newaxis, :]
+        return (np.einsum("ni,nj,nij->n", sv, dv, self.ratios[rows, cols])
+                + np.einsum("ni,nj,nij->n", ss, dv, self.d_speed[rows, cols])
+                + np.einsum("ni,nj,nij->n", sv, ds, self.d_distance[rows, cols])
+                + np.einsum("ni,nj,nij->n", ss, ds, self.d_cross[rows, cols]))
+
+    def errors_at(self, speed, distance):
+        """Absolute flight time error against the drag integrator"""
+        return np.abs(self.calculate_flight_time(speed, distance)
+                      - calculate_flight_time(speed, distance))
+
+    def refinement_errors(self):
+        """Worst errors halfway between grid nodes, per speed and distance interval
+
+        Returns (speed_errors, distance_errors, cell_errors): the first two are
+        checked along grid lines (isolating each axis), the last at cell
+        centres, shaped (speed intervals, distance intervals).
+        """
+        s_mid = 0.5 * (self.speeds[1:] + self.speeds[:-1])
+        d_mid = 0.5 * (self.distances[1:] + self.distances[:-1])
+        speed_errors = self.errors_at(s_mid[:, np.newaxis], self.distances).max(axis=1)
+        distance_errors = self.errors_at(self.speeds[:, np.newaxis], d_mid).max(axis=0)
+        cell_errors = self.errors_at(s_mid[:, np.newaxis], d_mid)
+        return speed_errors, distance_errors, cell_errors
+
+    def sampled_error(self, count=10_000, seed=0):
+        """Worst error against the drag integrator at random points in the table"""
+        rng = np.random.default_rng(seed)
+        speed = rng.uniform(self.speeds[0], self.speeds[-1], count)
+        distance = rng.uniform(self.distances[0], self.distances[-1], count)
+        return float(self.errors_at(speed, distance).max())
+
+    @classmethod
+    def build(cls, speed_range=(SPEED_MIN, SPEED_MAX),
+              distance_range=(DISTANCE_MIN, DISTANCE_MAX), points=(10, 10),
+              method="cubic", error_bound=ERROR_BOUND, max_rounds=20):
+        """Build a table and refine it until its checked errors are within error_bound
+
+        Each round halves the speed and distance intervals whose midpoint
+        errors are over the bound; a cell over the bound whose axes both pass
+        has both of its intervals halved. max_error holds the final worst
+        checked error; the true worst case between check points can be a few
+        times larger, see sampled_error. A RuntimeWarning is issued when
+        max_rounds run out before the bound is met.
+        """
+        table = cls(np.linspace(*speed_range, points[0]),
+                    np.linspace(*distance_range, points[1]), method)
+        for round_ in range(max_rounds + 1):
+            speed_errors, distance_errors, cell_errors = table.refinement_errors()
+            table.max_error = float(max(speed_errors.max(), distance_errors.max(),
+                                        cell_errors.max()))
+            if table.max_error <= error_bound:
+                break
+            if round_ == max_rounds:
+                warnings.warn(f"Flight time table stopped at {table.max_error:.3g} s after "
+                              f"{max_rounds} rounds, over the {error_bound:.3g} s bound",
+                              RuntimeWarning, stacklevel=2)
+                break
+            split_speeds = speed_errors > error_bound
+            split_distances = distance_errors > error_bound
+            cells = ((cell_errors > error_bound)
+                     & ~split_speeds[:, np.newaxis] & ~split_distances)
+            table = cls(_refine(table.speeds, split_speeds | cells.any(axis=1)),
+                        _refine(table.distances,
+                                split_distances | cells.any(axis=0)), method)
+        return table
+
+
+def _refine(grid, split):
+    """Insert the midpoint of every interval flagged in split"""
+    midpoints = 0.5 * (grid[1:] + grid[:-1])[split]
+    return np.sort(np.concatenate([grid, midpoints]))
+
+
+@lru_cache(maxsize=1)
+def default_table():
+    """Table covering the slider domain, built on first use"""
+    return FlightTimeTable.build()
+
+
+def calculate_table_flight_time(speed, distance):
+    """Calculate flight time with air drag from the default interpolation table"""
+    return default_table().calculate_flight_time(speed, distance)
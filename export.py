@@ -0,0 +1,130 @@
+"""Columnar export of equivalency results
+
+Writes Arrow IPC files (.arrow/.feather) and Parquet files (.parquet) when
+pyarrow is installed, and NumPy structured arrays (.npy) otherwise. Columns
+go straight from NumPy buffers into Arrow arrays or the .npy file without
+passing through Python objects, and files are written batch by batch so
+streaming producers keep flat memory.
+"""
+import struct
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency; .npy export still works
+    pa = ipc = pq = None
+
+FORMATS = {".arrow": "arrow", ".feather": "arrow", ".parquet": "parquet",
+           ".npy": "npy"}
+
+# Fixed width for string columns in .npy output (longer values are truncated)
+NPY_STRING_WIDTH = 32
+
+
+def format_for_path(path):
+    """Export format implied by a file extension"""
+    for extension, fmt in FORMATS.items():
+        if path.endswith(extension):
+            return fmt
+    raise ValueError(f"Unknown columnar format for {path!r}; use one of "
+                     + ", ".join(FORMATS))
+
+
+def _npy_header(dtype, rows, size):
+    header = repr({"descr": np.lib.format.dtype_to_descr(dtype),
+                   "fortran_order": False, "shape": (rows,)})
+    header = header.ljust(size - 11) + "\n"
+    return b"\x93NUMPY\x01\x00" + struct.pack("<H", len(header)) + header.encode("latin1")
+
+
+class ColumnarWriter:
+    """Write batches of named columns to an Arrow, Parquet or .npy file
+
+    fields is a list of (name, dtype) pairs; use str for string columns.
+    Each write() takes a dict of equal-length columns and appends them.
+    """
+
+    def __init__(self, path, fields, fmt=None):
+        self.path = path
+        self.fields = fields
+        self.format = fmt or format_for_path(path)
+        self.rows = 0
+        if self.format in ("arrow", "parquet"):
+            if pa is None:
+                raise RuntimeError(f"{self.format} export needs pyarrow; "
+                                   "install it or write .npy instead")
+            self._schema = pa.schema([
+                (name, pa.string() if dtype is str else pa.from_numpy_dtype(dtype))
+                for name, dtype in fields])
+            if self.format == "arrow":
+                self._writer = ipc.new_file(path, self._schema)
+            else:
+                self._writer = pq.ParquetWriter(path, self._schema)
+        else:
+            self._dtype = np.dtype([
+                (name, f"U{NPY_STRING_WIDTH}" if dtype is str else dtype)
+                for name, dtype in fields])
+            # The row count isn't known until close(), so reserve room in the
+            # header for the largest possible shape and rewrite it then
+            self._header_size = -(-len(_npy_header(self._dtype, 10**18, 0)) // 64) * 64
+            self._file = open(path, "wb")
+            self._file.write(_npy_header(self._dtype, 0, self._header_size))
+
+    def write(self, columns):
+        count = len(columns[self.fields[0][0]])
+        if self.format in ("arrow", "parquet"):
+            batch = pa.record_batch([pa.array(columns[name]) for name, _ in self.fields],
+                                    schema=self._schema)
+            if self.format == "arrow":
+                self._writer.write_batch(batch)
+            else:
+                self._writer.write_table(pa.Table.from_batches([batch]))
+        else:
+            records = np.empty(count, dtype=self._dtype)
+            for name, _ in self.fields:
+                records[name] = columns[name]
+            self._file.write(records.tobytes())
+        self.rows += count
+
+    def close(self):
+        if self.format in ("arrow", "parquet"):
+            self._writer.close()
+        else:
+            self._file.seek(0)
+            self._file.write(_npy_header(self._dtype, self.rows, self._header_size))
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def write_columns(path, columns, fmt=None):
+    """Write a dict of equal-length NumPy columns to a columnar file in one batch"""
+    fields = [(name, str if np.asarray(values).dtype.kind in "OUS"
+               else np.asarray(values).dtype) for name, values in columns.items()]
+    with ColumnarWriter(path, fields, fmt) as writer:
+        writer.write(columns)
+
+
+def read_columns(path, fmt=None):
+    """Load a file written by ColumnarWriter as a dict of NumPy columns
+
+    .npy and Arrow IPC files are memory-mapped rather than read.
+    """
+    fmt = fmt or format_for_path(path)
+    if fmt == "npy":
+        records = np.load(path, mmap_mode="r")
+        return {name: records[name] for name in records.dtype.names}
+    if pa is None:
+        raise RuntimeError(f"Reading {fmt} files needs pyarrow")
+    if fmt == "arrow":
+        table = ipc.open_file(pa.memory_map(path)).read_all()
+    else:
+        table = pq.read_table(path)
+    return {name: table.column(name).to_numpy() for name in table.column_names}
@@ -0,0 +1,276 @@
+"""Plotly figure builder for the equivalency chart
+
+Everything that doesn't depend on the input (layout, axes, grid colors,
+legend, margins, trace and reference line styles, template) is built and
+validated by Plotly once. Each request only fills in the data arrays,
+reference points, line positions and title.
+
+figure_dict returns the raw figure dict and skips Plotly's per-property
+validation; build_figure wraps the same dict in a go.Figure, which Plotly
+validates (python benchmark.py figures shows the cost; main.py pays it once
+per cached input).
+
+Curve arrays are sent as Plotly typed arrays (base64 "bdata" with a
+"dtype"), float32 when every value survives the cast within
+FLOAT32_TOLERANCE, instead of JSON number lists; pass binary=False for
+plain lists.
+
+animated_figure_dict adds precomputed frames along the speed or distance
+axis with a Plotly slider, so the chart can be scrubbed in the browser.
+Each frame carries its reaction time as an annotation. All frames come
+from one calculate_equivalency_matrix call, and slider values are
+decimated until the whole figure fits in a payload budget.
+"""
+import base64
+import json
+import math
+from functools import lru_cache
+
+import numpy as np
+import plotly.graph_objects as go
+
+from utils import (PRESET_DISTANCES, calculate_equivalency_matrix,
+                   generate_distance_range, table_speeds)
+
+REFERENCE_NAMES = ("BP (20ft)", "10U (42ft)", "12U (46ft)", "HS/Pro (54ft)")
+
+# Largest absolute error (mph or ft) allowed when sending an array as float32
+FLOAT32_TOLERANCE = 1e-4
+
+# Most JSON an animated figure may serialize to (data, layout and frames), in bytes
+FRAME_BUDGET = 500_000
+
+# Reaction time readout on animated charts, just above the plot area
+READOUT_STYLE = dict(xref="paper", yref="paper", x=0.5, y=1.0, yanchor="bottom",
+                     showarrow=False)
+
+# Frame axis -> slider current value (prefix, suffix)
+FRAME_AXES = {"speed": ("Speed: ", " mph"), "distance": ("Distance: ", " ft")}
+
+
+@lru_cache(maxsize=1)
+def base_template():
+    """Validated (layout, trace styles, line styles) shared by every chart
+
+    Trace styles are the curve, the input point and a reference point; line
+    styles are a reference distance line and the input distance line.
+    """
+    fig = go.Figure()
+
+    # Equivalent speed line
+    fig.add_trace(go.Scatter(mode='lines',
+                             name='Eqv. MPH',
+                             line=dict(color='#1f77b4', width=3)))
+
+    # Input point
+    fig.add_trace(
+        go.Scatter(mode='markers+text',
+                   name='Your Input',
+                   textposition="top center",
+                   marker=dict(color='#ff4b4b',
+                               size=15,
+                               symbol='star',
+                               line=dict(color='black', width=2))))
+
+    # Reference distance point
+    fig.add_trace(
+        go.Scatter(mode='markers+text',
+                   textposition="top center",
+                   marker=dict(size=8, symbol='circle'),
+                   showlegend=True))
+
+    fig.update_layout(title=dict(x=0.5, xanchor='center'),
+                      xaxis_title="Release Distance (feet)",
+                      yaxis_title="Speed (mph)",
+                      hovermode='x unified',
+                      showlegend=False,
+                      legend=dict(yanchor="bottom",
+                                  orientation="h",
+                                  y=-0.30,
+                                  xanchor="center",
+                                  x=0.5),
+                      margin=dict(l=50, r=50, t=80, b=50))
+
+    # Reference and input distance lines
+    fig.add_vline(x=0, line_dash="dot", line_color="gray", opacity=0.5)
+    fig.add_vline(x=0, line_dash="dot", line_color="red", opacity=0.5)
+
+    fig.update_xaxes(range=[15, 62], dtick=5, gridcolor='lightgray')
+    fig.update_yaxes(gridcolor='lightgray')
+
+    spec = fig.to_dict()
+    layout = spec["layout"]
+    lines = tuple(layout.pop("shapes"))
+    return layout, tuple(spec["data"]), lines
+
+
+def _line(style, x):
+    return dict(style, x0=x, x1=x)
+
+
+def typed_array(values, dtype=None):
+    """Plotly typed-array spec for a 1-D float array
+
+    dtype is "f4" or "f8"; by default float32 is used when every value
+    round-trips within FLOAT32_TOLERANCE, float64 otherwise.
+    """
+    values = np.asarray(values, dtype="<f8")
+    if dtype is None:
+        single = values.astype("<f4")
+        dtype = "f4" if np.all(np.abs(single - values) <= FLOAT32_TOLERANCE) else "f8"
+    encoded = values.astype("<" + dtype).tobytes()
+    return {"dtype": dtype, "bdata": base64.b64encode(encoded).decode("ascii")}
+
+
+def decode_typed_array(spec):
+    """Inverse of typed_array, as a float64 array"""
+    return np.frombuffer(base64.b64decode(spec["bdata"]), dtype="<" + spec["dtype"]).astype(float)
+
+
+def _array(values, binary):
+    return typed_array(values) if binary else np.asarray(values, dtype=float).tolist()
+
+
+def figure_dict(speed, distance, distances, equiv_speeds, reference_speeds, binary=True):
+    """Raw Plotly figure dict for one input, without per-property validation
+
+    The result shares nested style dicts with the cached template, so
+    treat it as read-only.
+    """
+    layout, (curve, point, reference), (reference_line, input_line) = base_template()
+    data = [dict(curve, x=_array(distances, binary), y=_array(equiv_speeds, binary)),
+            dict(point, x=[distance], y=[speed], text=[f"{speed} mph"])]
+    shapes = []
+    for dist, name, equiv_speed in zip(PRESET_DISTANCES, REFERENCE_NAMES,
+                                       reference_speeds):
+        # Only mark a reference distance that differs from the input distance
+        if dist != distance:
+            shapes.append(_line(reference_line, dist))
+            data.append(dict(reference, x=[dist], y=[equiv_speed], name=name,
+                             text=[f"{equiv_speed:.1f} mph"]))
+    shapes.append(_line(input_line, distance))
+
+    title = dict(layout["title"],
+                 text=f"Equivalent Speeds for {speed} mph at {distance} ft")
+    return {"data": data, "layout": dict(layout, title=title, shapes=shapes)}
+
+
+def build_figure(speed, distance, distances, equiv_speeds, reference_speeds, binary=True):
+    """Validated go.Figure for one input, built from figure_dict"""
+    return go.Figure(figure_dict(speed, distance, distances, equiv_speeds,
+                                 reference_speeds, binary))
+
+
+def frame_values(axis):
+    """Every slider value along a frame axis ("speed" or "distance")"""
+    if axis == "speed":
+        return table_speeds()
+    if axis == "distance":
+        return generate_distance_range()
+    raise ValueError(f"Unknown frame axis {axis!r}; use one of " + ", ".join(FRAME_AXES))
+
+
+def _animation_frame(name, speed, distance, reaction_time, curve, reference_speeds, binary):
+    layout, _, (reference_line, input_line) = base_template()
+    data = [{"y": _array(curve, binary)},
+            {"x": [distance], "y": [speed], "text": [f"{speed} mph"]}]
+    shapes = []
+    for dist, equiv_speed in zip(PRESET_DISTANCES, reference_speeds):
+        # Every frame has all four reference traces; the one on the input
+        # distance is hidden rather than left out, as figure_dict does
+        if dist != distance:
+            shapes.append(_line(reference_line, dist))
+            data.append({"visible": True, "y": [equiv_speed],
+                         "text": [f"{equiv_speed:.1f} mph"]})
+        else:
+            data.append({"visible": False})
+    shapes.append(_line(input_line, distance))
+    title = dict(layout["title"],
+                 text=f"Equivalent Speeds for {speed} mph at {distance} ft")
+    readout = dict(READOUT_STYLE, text=f"⏱️ Reaction Time: {reaction_time:.3f} seconds")
+    return {"name": name, "data": data, "traces": list(range(len(data))),
+            "layout": {"title": title, "shapes": shapes, "annotations": [readout]}}
+
+
+def animation_frames(axis, values, speed, distance, binary=True):
+    """Frames for the given values along axis, the other input held fixed
+
+    The reaction times, curves and reference speeds for every frame come
+    from one calculate_equivalency_matrix call.
+    """
+    values = np.asarray(values, dtype=float)
+    if axis == "speed":
+        speeds, distances = values, np.full(values.shape, float(distance))
+    else:
+        speeds, distances = np.full(values.shape, float(speed)), values
+    grid = generate_distance_range()
+    targets = np.concatenate([grid, PRESET_DISTANCES])
+    times = np.empty(values.shape)
+    matrix = calculate_equivalency_matrix(speeds, distances, targets, times_out=times)
+    frames = []
+    for frame_speed, frame_distance, time, row in zip(speeds.tolist(), distances.tolist(),
+                                                      times.tolist(), matrix):
+        frame_speed = int(frame_speed)
+        name = str(frame_speed) if axis == "speed" else str(frame_distance)
+        frames.append(_animation_frame(name, frame_speed, frame_distance, time,
+                                       row[:grid.size], row[grid.size:].tolist(), binary))
+    return frames
+
+
+def _animated_spec(axis, values, speed, distance, binary):
+    """Figure dict with a frame and slider step for each of values"""
+    prefix, suffix = FRAME_AXES[axis]
+    frames = animation_frames(axis, values, speed, distance, binary)
+    layout, (curve, point, reference), _ = base_template()
+    active = int(np.searchsorted(values, speed if axis == "speed" else distance))
+    first = frames[active]["data"]
+    data = [dict(curve, x=_array(generate_distance_range(), binary), **first[0]),
+            dict(point, **first[1])]
+    for dist, name, update in zip(PRESET_DISTANCES, REFERENCE_NAMES, first[2:]):
+        data.append(dict(reference, x=[dist], name=name, **update))
+
+    step_options = {"mode": "immediate", "frame": {"duration": 0, "redraw": True},
+                    "transition": {"duration": 0}}
+    slider = {"active": active,
+              "currentvalue": {"prefix": prefix, "suffix": suffix},
+              "pad": {"t": 50},
+              "steps": [{"label": frame["name"], "method": "animate",
+                         "args": [[frame["name"]], step_options]} for frame in frames]}
+    return {"data": data,
+            "layout": dict(layout, **frames[active]["layout"], sliders=[slider],
+                           margin=dict(layout["margin"], b=150)),
+            "frames": frames}
+
+
+def animated_figure_dict(speed, distance, axis="speed", budget=FRAME_BUDGET, binary=True):
+    """Raw figure dict with precomputed frames and a slider along axis
+
+    speed and distance must lie on the slider grid. Frames cover every
+    slider value along axis, or every n-th one (always including the
+    current input) when the serialized figure would exceed budget bytes.
+    Raises ValueError when even a figure with only the current frame does.
+    """
+    values = frame_values(axis)
+    current = speed if axis == "speed" else distance
+
+    # Size a one-frame figure to estimate the decimation, then tighten it if needed
+    single = _animated_spec(axis, np.array([current]), speed, distance, binary)
+    if len(json.dumps(single)) > budget:
+        raise ValueError(f"A {axis} frame figure needs at least "
+                         f"{len(json.dumps(single))} bytes, over the {budget} byte budget")
+    frame_bytes = (len(json.dumps(single["frames"][0]))
+                   + len(json.dumps(single["layout"]["sliders"][0]["steps"][0])))
+    room = max(budget - (len(json.dumps(single)) - frame_bytes), frame_bytes)
+    stride = max(1, math.ceil(values.size * frame_bytes / room))
+    while stride < values.size:
+        spec = _animated_spec(axis, np.union1d(values[::stride], [current]), speed,
+                              distance, binary)
+        if len(json.dumps(spec)) <= budget:
+            return spec
+        stride += 1
+    return single
+
+
+def build_animated_figure(speed, distance, axis="speed", budget=FRAME_BUDGET, binary=True):
+    """Validated go.Figure for animated_figure_dict"""
+    return go.Figure(animated_figure_dict(speed, distance, axis, budget, binary))
@@ -0,0 +1,136 @@
+"""Fit Chebyshev surrogates for the drag model and write surrogate_coefficients.py
+
+Run with: python fit_surrogate.py
+
+Two 2-D Chebyshev series are fitted, each as a correction factor on top of
+the closed form in utils:
+
+- flight time / constant-speed reaction time, over (release speed, distance)
+- drag equivalent speed / constant-speed equivalent speed, over
+  (constant-speed equivalent speed, distance)
+
+utils imports the generated module and evaluates the series with Clenshaw
+recurrences. An accuracy and speed report against the closed form and the
+drag integrator is printed after fitting.
+"""
+import importlib
+import os
+import time
+
+import numpy as np
+from numpy.polynomial import chebyshev
+
+from drag import calculate_flight_time, calculate_drag_equivalent_speeds
+from utils import (SPEED_MIN, SPEED_MAX, DISTANCE_MIN, DISTANCE_MAX,
+                   calculate_reaction_time, calculate_equivalent_speeds)
+
+OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                      "surrogate_coefficients.py")
+
+FLIGHT_TIME_DOMAIN = ((SPEED_MIN, SPEED_MAX), (DISTANCE_MIN, DISTANCE_MAX))
+FLIGHT_TIME_DEGREE = (16, 6)
+
+# Equivalent speeds on the chart reach far outside the slider range (110 mph
+# at 15 ft is ~440 mph at 60.5 ft, 20 mph at 60.5 ft is ~4.96 mph at 15 ft),
+# so the inverse covers a wider span
+EQUIVALENT_SPEED_DOMAIN = ((4.0, 450.0), (DISTANCE_MIN, DISTANCE_MAX))
+EQUIVALENT_SPEED_DEGREE = (40, 8)
+
+
+def flight_time_ratio(speed, distance):
+    return calculate_flight_time(speed, distance) / calculate_reaction_time(speed, distance)
+
+
+def equivalent_speed_ratio(constant_speed, distance):
+    target_time = calculate_reaction_time(constant_speed, distance)
+    return calculate_drag_equivalent_speeds(target_time, distance) / constant_speed
+
+
+def fit(func, domain, degree):
+    """Least-squares Chebyshev fit of func(x, y) sampled on Chebyshev points"""
+    (x0, x1), (y0, y1) = domain
+    u, v = np.meshgrid(chebyshev.chebpts1(2 * degree[0] + 2),
+                       chebyshev.chebpts1(2 * degree[1] + 2), indexing="ij")
+    x = 0.5 * (x0 + x1) + 0.5 * (x1 - x0) * u
+    y = 0.5 * (y0 + y1) + 0.5 * (y1 - y0) * v
+    vander = chebyshev.chebvander2d(u.ravel(), v.ravel(), degree)
+    coefficients = np.linalg.lstsq(vander, func(x, y).ravel(), rcond=None)[0]
+    return coefficients.reshape(degree[0] + 1, degree[1] + 1)
+
+
+def format_array(name, coefficients):
+    rows = ",\n".join("    [" + ", ".join(repr(float(c)) for c in row) + "]"
+                      for row in coefficients)
+    return f"{name} = [\n{rows},\n]\n"
+
+
+def write_module(path, flight_time, equivalent_speed):
+    """Write the coefficients as an importable module"""
+    source = (
+        '"""Chebyshev surrogate coefficients, generated by fit_surrogate.py -- do not edit"""\n\n'
+        f"FLIGHT_TIME_DOMAIN = {FLIGHT_TIME_DOMAIN!r}\n"
+        f"EQUIVALENT_SPEED_DOMAIN = {EQUIVALENT_SPEED_DOMAIN!r}\n\n"
+        + format_array("FLIGHT_TIME_COEFFICIENTS", flight_time) + "\n"
+        + format_array("EQUIVALENT_SPEED_COEFFICIENTS", equivalent_speed))
+    with open(path, "w") as f:
+        f.write(source)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def report(count=200_000, seed=0):
+    """Print surrogate accuracy and speed against the closed form and drag models"""
+    # Pick up the module main() just wrote
+    import surrogate_coefficients
+    import utils
+    importlib.reload(surrogate_coefficients)
+    importlib.reload(utils)
+    calculate_surrogate_flight_time = utils.calculate_surrogate_flight_time
+    calculate_surrogate_equivalent_speeds = utils.calculate_surrogate_equivalent_speeds
+
+    rng = np.random.default_rng(seed)
+    speeds = rng.uniform(SPEED_MIN, SPEED_MAX, count)
+    distances = rng.uniform(DISTANCE_MIN, DISTANCE_MAX, count)
+
+    closed, closed_time = timed(calculate_reaction_time, speeds, distances)
+    drag, drag_time = timed(calculate_flight_time, speeds, distances)
+    fitted, fitted_time = timed(calculate_surrogate_flight_time, speeds, distances)
+    print(f"Flight time over {count} random points in the slider domain")
+    print(f"  max |surrogate - drag|:        {np.abs(fitted - drag).max():.2e} s")
+    print(f"  max |closed form - drag|:      {np.abs(closed - drag).max():.2e} s")
+    print(f"  closed form: {closed_time * 1e3:8.2f} ms")
+    print(f"  drag RK4:    {drag_time * 1e3:8.2f} ms")
+    print(f"  surrogate:   {fitted_time * 1e3:8.2f} ms")
+
+    targets = calculate_reaction_time(speeds[:2000], distances[:2000])
+    grid = rng.uniform(DISTANCE_MIN, DISTANCE_MAX, targets.size)
+    constant_speeds = calculate_equivalent_speeds(targets, grid)
+    low, high = EQUIVALENT_SPEED_DOMAIN[0]
+    inside = (constant_speeds >= low) & (constant_speeds <= high)
+    targets, grid = targets[inside], grid[inside]
+    closed, closed_time = timed(calculate_equivalent_speeds, targets, grid)
+    drag, drag_time = timed(calculate_drag_equivalent_speeds, targets, grid)
+    fitted, fitted_time = timed(calculate_surrogate_equivalent_speeds, targets, grid)
+    print(f"Equivalent speed over {targets.size} random (time, distance) pairs")
+    print(f"  max |surrogate - drag|:        {np.abs(fitted - drag).max():.2e} mph")
+    print(f"  max |closed form - drag|:      {np.abs(closed - drag).max():.2e} mph")
+    print(f"  closed form: {closed_time * 1e3:8.2f} ms")
+    print(f"  drag solve:  {drag_time * 1e3:8.2f} ms")
+    print(f"  surrogate:   {fitted_time * 1e3:8.2f} ms")
+
+
+def main():
+    flight_time = fit(flight_time_ratio, FLIGHT_TIME_DOMAIN, FLIGHT_TIME_DEGREE)
+    equivalent_speed = fit(equivalent_speed_ratio, EQUIVALENT_SPEED_DOMAIN,
+                           EQUIVALENT_SPEED_DEGREE)
+    write_module(OUTPUT, flight_time, equivalent_speed)
+    print(f"Wrote {OUTPUT}")
+    report()
+
+
+if __name__ == "__main__":
+    main()
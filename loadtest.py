@@ -0,0 +1,142 @@
+"""Load test for the HTTP JSON API in server.py
+
+Run with:
+    python server.py &
+    python loadtest.py [--endpoint reaction-time] [--connections 32]
+                       [--duration 10] [--batch-size 1000]
+
+Opens keep-alive connections that each send requests back to back for the
+given duration, then reports requests/s, latency percentiles and the
+server's coalescer metrics (batch sizes and queueing delay). Use
+--start-server to run the server in a subprocess for the test; extra server
+options such as --no-coalesce or --max-delay-us go after --server-args.
+"""
+import argparse
+import asyncio
+import http.client
+import json
+import random
+import socket
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from server import HOST, PORT
+
+
+def make_body(endpoint, rng, batch_size):
+    """JSON body for one request, with inputs drawn from the valid ranges"""
+    if endpoint == "batch":
+        return {"speeds": [rng.uniform(20, 110) for _ in range(batch_size)],
+                "distances": [rng.uniform(15, 60.5) for _ in range(batch_size)]}
+    return {"speed": rng.randint(20, 110), "distance": rng.randint(30, 121) / 2}
+
+
+async def client(host, port, endpoint, deadline, latencies, errors, batch_size, seed):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            body = json.dumps(make_body(endpoint, rng, batch_size)).encode()
+            request = (f"POST /{endpoint} HTTP/1.1\r\nHost: {host}\r\n"
+                       "Content-Type: application/json\r\n"
+                       f"Content-Length: {len(body)}\r\n\r\n").encode() + body
+            start = time.perf_counter()
+            writer.write(request)
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            if not head.startswith(b"HTTP/1.1 200"):
+                errors.append(head.split(b"\r\n", 1)[0].decode())
+    finally:
+        writer.close()
+
+
+async def run(host, port, endpoint, connections, duration, batch_size):
+    latencies, errors = [], []
+    deadline = time.perf_counter() + duration
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, endpoint, deadline, latencies, errors,
+                                  batch_size, seed) for seed in range(connections)))
+    return latencies, errors, time.perf_counter() - start
+
+
+def wait_for_server(host, port, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            socket.create_connection((host, port)).close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+def fetch_metrics(host, port):
+    connection = http.client.HTTPConnection(host, port)
+    try:
+        connection.request("GET", "/metrics")
+        return json.loads(connection.getresponse().read())
+    finally:
+        connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--endpoint", default="reaction-time",
+                        choices=["reaction-time", "equivalent-speeds", "validate", "batch"])
+    parser.add_argument("--connections", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--batch-size", type=int, default=1000,
+                        help="rows per request for the batch endpoint")
+    parser.add_argument("--start-server", action="store_true",
+                        help="run server.py in a subprocess for the test")
+    parser.add_argument("--server-args", nargs=argparse.REMAINDER, default=[],
+                        help="extra arguments for the --start-server subprocess")
+    args = parser.parse_args()
+
+    server = None
+    if args.start_server:
+        server = subprocess.Popen([sys.executable, "server.py", "--host", args.host,
+                                   "--port", str(args.port), *args.server_args],
+                                  stdout=subprocess.DEVNULL)
+    try:
+        wait_for_server(args.host, args.port)
+        latencies, errors, elapsed = asyncio.run(run(args.host, args.port, args.endpoint,
+                                                     args.connections, args.duration,
+                                                     args.batch_size))
+        metrics = fetch_metrics(args.host, args.port)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    latencies_ms = np.array(latencies) * 1000
+    rows = len(latencies) * (args.batch_size if args.endpoint == "batch" else 1)
+    print(f"{args.endpoint}: {len(latencies)} requests over {args.connections} "
+          f"connections in {elapsed:.1f}s")
+    print(f"  {len(latencies) / elapsed:,.0f} requests/s, {rows / elapsed:,.0f} rows/s")
+    print("  latency ms: " + ", ".join(
+        f"p{p} {np.percentile(latencies_ms, p):.2f}" for p in (50, 90, 99, 99.9))
+        + f", max {latencies_ms.max():.2f}")
+    if errors:
+        print(f"  {len(errors)} non-200 responses, first: {errors[0]}")
+    for name, stats in metrics.items():
+        if stats["batches"]:
+            delay = stats["queue_delay_us"]
+            print(f"  {name} coalescer: {stats['batches']} batches, mean size "
+                  f"{stats['mean_batch_size']:.1f}, max {stats['max_batch_size']}; "
+                  f"queue delay us p50 {delay['p50']:.0f}, p99 {delay['p99']:.0f}")
+
+
+if __name__ == "__main__":
+    main()
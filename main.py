@@ -1,8 +1,28 @@
+import os
+
 import streamlit as st
-import plotly.graph_objects as go
-import numpy as np
-from utils import (calculate_reaction_time, calculate_equivalent_speeds,
-                   generate_distance_range, validate_inputs)
+import streamlit.components.v1 as components
+from utils import (calculate_equivalent_speeds, generate_distance_range,
+                   get_distance_points, lookup_reaction_time,
+                   lookup_equivalent_speeds, quantize_inputs, validate_inputs)
+from client_chart import HEIGHT as CLIENT_CHART_HEIGHT, render_html
+from drag import calculate_flight_time, calculate_drag_equivalent_speeds
+from figures import build_animated_figure, build_figure
+from singleflight import SingleFlight
+
+# Bounds for the curve and figure caches shared by all sessions
+CACHE_ENTRIES = int(os.environ.get("PITCH_CACHE_ENTRIES", 2048))
+CACHE_TTL = float(os.environ.get("PITCH_CACHE_TTL", 3600))  # seconds
+# Animated figures carry every frame, so far fewer of them are kept
+ANIMATION_CACHE_ENTRIES = int(os.environ.get("PITCH_ANIMATION_CACHE_ENTRIES", 64))
+
+# Chart update modes -> frame axis for the precomputed frame modes
+CHART_MODES = {
+    "On each change": None,
+    "In the browser": None,
+    "Speed frames": "speed",
+    "Distance frames": "distance",
+}
 
 # Page configuration
 st.set_page_config(page_title="Pitch Speed Equivalency Calculator",
@@ -68,6 +88,66 @@ def get_matching_preset_index():
     return 0
 
 
+# Sessions asking for the same key at the same time share one cache lookup,
+# and so one computation on a miss. The flights sit in front of the caches:
+# Streamlit already serializes misses per key, so behind them nothing merges.
+@st.cache_resource
+def get_flights():
+    return {"curve": SingleFlight(), "figure": SingleFlight(), "animation": SingleFlight()}
+
+
+def compute_curve(speed, distance, use_drag):
+    """Reaction time, equivalent speed curve and reference point speeds"""
+    if use_drag:
+        reaction_time = calculate_flight_time(speed, distance)
+        equivalent_speeds = calculate_drag_equivalent_speeds
+        equiv_speeds = equivalent_speeds(reaction_time, generate_distance_range())
+    else:
+        reaction_time = lookup_reaction_time(speed, distance)
+        equivalent_speeds = calculate_equivalent_speeds
+        equiv_speeds = lookup_equivalent_speeds(speed, distance)
+
+    # Calculate equivalent speeds at all reference distances in one call
+    reference_speeds = equivalent_speeds(reaction_time, get_distance_points())
+    return reaction_time, equiv_speeds, reference_speeds
+
+
+@st.cache_data(max_entries=CACHE_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def curve_cache(speed, distance, use_drag):
+    return compute_curve(speed, distance, use_drag)
+
+
+# The figure is shared rather than copied per session; nothing mutates it
+@st.cache_resource(max_entries=CACHE_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def figure_cache(speed, distance, use_drag):
+    _, equiv_speeds, reference_speeds = cached_curve(speed, distance, use_drag)
+    return build_figure(speed, distance, generate_distance_range(), equiv_speeds,
+                        reference_speeds)
+
+
+@st.cache_resource(max_entries=ANIMATION_CACHE_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def animation_cache(speed, distance, axis):
+    return build_animated_figure(speed, distance, axis)
+
+
+def cached_curve(speed, distance, use_drag):
+    """compute_curve for quantized inputs, cached across reruns and sessions"""
+    return get_flights()["curve"].do((speed, distance, use_drag), curve_cache,
+                                     speed, distance, use_drag)
+
+
+def cached_figure(speed, distance, use_drag):
+    """build_figure for quantized inputs, cached across reruns and sessions"""
+    return get_flights()["figure"].do((speed, distance, use_drag), figure_cache,
+                                      speed, distance, use_drag)
+
+
+def cached_animation(speed, distance, axis):
+    """Chart with precomputed frames along axis, for quantized inputs"""
+    return get_flights()["animation"].do((speed, distance, axis), animation_cache,
+                                         speed, distance, axis)
+
+
 # Preset selector
 preset_options = ["Custom"] + [
     f"{label} ({speed} mph @ {dist} ft)"
@@ -83,26 +163,49 @@ preset_selection = st.selectbox(
     on_change=on_preset_change,
     help="Select a common age group preset or use Custom")
 
-# Input form
-col1, col2 = st.columns(2)
-with col1:
-    speed = st.slider("Pitch Velo (mph)",
-                      min_value=20,
-                      max_value=110,
-                      value=st.session_state.speed,
-                      step=1,
-                      help="Pitch speed in miles per hour")
-    st.session_state.speed = speed
-
-with col2:
-    distance = st.slider(
-        "Release Distance (ft)",
-        min_value=15.0,
-        max_value=60.5,
-        value=st.session_state.distance,
-        step=0.5,
-        help="Enter the distance from pitcher to batter (15-60.5 feet)")
-    st.session_state.distance = distance
+# Input form; the browser chart has its own sliders, which the page
+# sliders would fall out of sync with, so it only gets the starting values
+browser_chart = (st.session_state.get("chart_mode") == "In the browser"
+                 and not st.session_state.get("use_drag"))
+if browser_chart:
+    speed, distance = st.session_state.speed, st.session_state.distance
+else:
+    col1, col2 = st.columns(2)
+    with col1:
+        speed = st.slider("Pitch Velo (mph)",
+                          min_value=20,
+                          max_value=110,
+                          value=st.session_state.speed,
+                          step=1,
+                          help="Pitch speed in miles per hour")
+        st.session_state.speed = speed
+
+    with col2:
+        distance = st.slider(
+            "Release Distance (ft)",
+            min_value=15.0,
+            max_value=60.5,
+            value=st.session_state.distance,
+            step=0.5,
+            help="Enter the distance from pitcher to batter (15-60.5 feet)")
+        st.session_state.distance = distance
+
+use_drag = st.toggle(
+    "Include air drag",
+    value=False,
+    key="use_drag",
+    help="Account for the speed a pitch loses to air resistance on its way to the plate")
+
+chart_mode = st.radio(
+    "Chart updates",
+    options=list(CHART_MODES),
+    horizontal=True,
+    disabled=use_drag,
+    key="chart_mode",
+    help="In the browser: the chart's own sliders (in place of the ones above) update it "
+    "instantly without reloading. "
+    "Speed/Distance frames: scrub through precomputed charts with the slider under the chart. "
+    "Neither is available with air drag")
 
 # Reset dropdown to Custom if slider values don't match any preset
 if get_matching_preset_index() == 0 and st.session_state.get(
@@ -116,98 +219,25 @@ if errors:
     for error in errors:
         st.error(error)
 else:
-    # Calculate initial reaction time
-    reaction_time = calculate_reaction_time(speed, distance)
-
-    # Generate distance range and calculate equivalent speeds
-    distances = generate_distance_range()
-    equiv_speeds = calculate_equivalent_speeds(reaction_time, distances)
-
-    # Create interactive chart
-    fig = go.Figure()
-
-    # Add equivalent speed line
-    fig.add_trace(
-        go.Scatter(x=distances,
-                   y=equiv_speeds,
-                   mode='lines',
-                   name='Eqv. MPH',
-                   line=dict(color='#1f77b4', width=3)))
-
-    # Add point for initial input
-    fig.add_trace(
-        go.Scatter(x=[distance],
-                   y=[speed],
-                   mode='markers+text',
-                   name='Your Input',
-                   text=[f"{speed} mph"],
-                   textposition="top center",
-                   marker=dict(color='#ff4b4b',
-                               size=15,
-                               symbol='star',
-                               line=dict(color='black', width=2))))
-
-    # Add reference distances (matching presets)
-    common_distances = [20, 42, 46, 54]
-    common_distance_names = [
-        "BP (20ft)", "10U (42ft)", "12U (46ft)", "HS/Pro (54ft)"
-    ]
-
-    for dist, name in zip(common_distances, common_distance_names):
-        # Calculate equivalent speed at this distance
-        equiv_speed = calculate_equivalent_speeds(reaction_time,
-                                                  np.array([dist]))[0]
-
-        # Only add reference line if dist does not equal input distance
-        if dist != distance:
-            # Add vertical line with label
-            fig.add_vline(
-                x=dist,
-                line_dash="dot",
-                line_color="gray",
-                opacity=0.5,
-                # annotation_text=f"{name}"
-            )
-
-            # Add point and label
-            fig.add_trace(
-                go.Scatter(x=[dist],
-                           y=[equiv_speed],
-                           mode='markers+text',
-                           name=name,
-                           text=[f"{equiv_speed:.1f} mph"],
-                           textposition="top center",
-                           marker=dict(size=8, symbol='circle'),
-                           showlegend=True))
-
-    # Customize layout
-    fig.update_layout(title=dict(
-        text=f"Equivalent Speeds for {speed} mph at {distance} ft",
-        x=0.5,
-        xanchor='center'),
-                      xaxis_title="Release Distance (feet)",
-                      yaxis_title="Speed (mph)",
-                      hovermode='x unified',
-                      showlegend=False,
-                      legend=dict(yanchor="bottom",
-                                  orientation="h",
-                                  y=-0.30,
-                                  xanchor="center",
-                                  x=0.5),
-                      margin=dict(l=50, r=50, t=80, b=50))
-
-    # Add vertical line for input distance
-    fig.add_vline(x=distance, line_dash="dot", line_color="red", opacity=0.5)
-
-    # Configure axes
-    fig.update_xaxes(range=[15, 62], dtick=5, gridcolor='lightgray')
-    fig.update_yaxes(gridcolor='lightgray')
-
-    # Display chart
-    st.plotly_chart(fig, use_container_width=True)
-
-    # Display reaction time
-    st.info(f"⏱️ Reaction Time: {reaction_time:.3f} seconds")
+    speed, distance = quantize_inputs(speed, distance)
+    if use_drag:
+        chart_mode = "On each change"
+    if chart_mode == "In the browser":
+        # The component's own sliders recompute the chart in the browser
+        components.html(render_html(speed, distance), height=CLIENT_CHART_HEIGHT)
+    elif CHART_MODES[chart_mode]:
+        # Each frame shows its own reaction time above the chart
+        fig = cached_animation(speed, distance, CHART_MODES[chart_mode])
+        st.plotly_chart(fig, use_container_width=True)
+    else:
+        reaction_time, _, _ = cached_curve(speed, distance, use_drag)
+        fig = cached_figure(speed, distance, use_drag)
+
+        # Display chart
+        st.plotly_chart(fig, use_container_width=True)
+
+        # Display reaction time
+        st.info(f"⏱️ Reaction Time: {reaction_time:.3f} seconds")
 
     # Additional information
     with st.expander("How to interpret this chart"):
@@ -216,9 +246,15 @@ else:
             - The red star shows your initial input point
             - Hover over the line to see exact values
             - Distance increments are in 0.5 feet
+            - With air drag on, speeds are release speeds for a ball that slows down on its way to the plate
             - Vertical lines mark common distances:
               - 20ft: BP (Batting Practice)
               - 42ft: 10U Baseball
               - 46ft: 12U Baseball
               - 54ft: HS (High School) / Pro
         """)
+
+# Single-flight counters, shown with ?stats: calls is every lookup, saved the
+# ones merged into another session's concurrent lookup
+if "stats" in st.query_params:
+    st.sidebar.json({name: flight.stats() for name, flight in get_flights().items()})
@@ -0,0 +1,165 @@
+"""Out-of-core processing of large pitch datasets through memory-mapped chunks
+
+The input is memory-mapped and processed a chunk at a time into a
+memory-mapped .npy output, so datasets larger than RAM work and peak RSS is
+bounded by the chunk size. After each chunk the mapped pages are released
+with madvise so they don't accumulate in the process's resident set.
+
+Supported inputs:
+- a .npy structured array with speed and distance fields
+- a .npy array of shape (rows, 2) holding speed, distance columns
+- a flat binary file of interleaved (speed, distance) pairs, given raw_dtype
+
+The output is a .npy structured array with reaction_time, one
+speed_at_<target>ft field per target distance and error_code (see
+utils.validate_arrays); invalid rows hold NaN.
+
+Long runs write a checkpoint next to the output (<output>.checkpoint) at
+most every checkpoint_interval seconds: the output is flushed to disk, then
+the offset of the next unprocessed row is recorded atomically. Running the
+same job again resumes from that offset, and because every row is computed
+independently the finished file is byte-identical to an uninterrupted run.
+The checkpoint is removed when the job completes.
+"""
+import json
+import mmap
+import os
+import time
+
+import numpy as np
+
+from utils import EquivalencyWorkspace, validate_arrays
+
+CHUNK_SIZE = 1_048_576
+
+# Seconds between checkpoints; None disables checkpointing
+CHECKPOINT_INTERVAL = 30.0
+
+
+def open_input_columns(path, raw_dtype=None):
+    """Memory-map an input file and return (speeds, distances) column views"""
+    if raw_dtype is not None:
+        data = np.memmap(path, dtype=raw_dtype, mode="r").reshape(-1, 2)
+        return data[:, 0], data[:, 1]
+    data = np.load(path, mmap_mode="r")
+    if data.dtype.names:
+        return data["speed"], data["distance"]
+    if data.ndim == 2 and data.shape[1] == 2:
+        return data[:, 0], data[:, 1]
+    raise ValueError(f"{path}: expected speed/distance fields or a (rows, 2) array")
+
+
+def target_field(target):
+    return f"speed_at_{target:g}ft"
+
+
+def output_dtype(targets):
+    return np.dtype([("reaction_time", np.float64)]
+                    + [(target_field(target), np.float64) for target in targets]
+                    + [("error_code", np.uint8)])
+
+
+def create_output(path, rows, targets):
+    """Create (or truncate) a memory-mapped .npy output for rows results"""
+    return np.lib.format.open_memmap(path, mode="w+", dtype=output_dtype(targets),
+                                     shape=(rows,))
+
+
+def open_output(path):
+    """Memory-map an existing output file for writing"""
+    return np.load(path, mmap_mode="r+")
+
+
+def release_pages(array):
+    """Drop a memory-mapped array's resident pages (data stays in the file)"""
+    while array is not None and not isinstance(array, np.memmap):
+        array = array.base
+    handle = getattr(array, "_mmap", None)
+    if handle is not None and hasattr(handle, "madvise"):
+        handle.madvise(mmap.MADV_DONTNEED)
+
+
+def process_chunk(workspace, speeds, distances, out, start, stop):
+    """Compute rows [start, stop) of the inputs into the same rows of out"""
+    speed_chunk = np.asarray(speeds[start:stop], dtype=float)
+    distance_chunk = np.asarray(distances[start:stop], dtype=float)
+    valid, codes = validate_arrays(speed_chunk, distance_chunk)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        times, equivalent = workspace.evaluate_batch(speed_chunk, distance_chunk)
+    rows = out[start:stop]
+    rows["reaction_time"] = np.where(valid, times, np.nan)
+    for j, target in enumerate(workspace.distances):
+        rows[target_field(target)] = np.where(valid, equivalent[:, j], np.nan)
+    rows["error_code"] = codes
+
+
+def checkpoint_path(output_path):
+    return output_path + ".checkpoint"
+
+
+def describe_job(input_path, output_path, rows, targets, raw_dtype):
+    """Everything a checkpoint must match to be resumed"""
+    stat = os.stat(input_path)
+    return {"input": os.path.abspath(input_path),
+            "input_size": stat.st_size,
+            "input_mtime_ns": stat.st_mtime_ns,
+            "output": os.path.abspath(output_path),
+            "rows": rows,
+            "targets": [float(target) for target in targets],
+            "raw_dtype": raw_dtype}
+
+
+def load_checkpoint(output_path, job):
+    """Row to resume from, or 0 if there is no matching checkpoint"""
+    try:
+        with open(checkpoint_path(output_path)) as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError):
+        return 0
+    if checkpoint.get("job") != job or not os.path.exists(output_path):
+        return 0
+    return int(checkpoint["next_row"])
+
+
+def save_checkpoint(output_path, job, next_row):
+    """Atomically record that every row before next_row is on disk"""
+    path = checkpoint_path(output_path)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"job": job, "next_row": next_row}, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def run_memmap(input_path, output_path, targets, chunk_size=CHUNK_SIZE,
+               raw_dtype=None, checkpoint_interval=CHECKPOINT_INTERVAL):
+    """Process a whole input file chunk by chunk; returns the number of rows
+
+    Resumes from a matching checkpoint if one exists.
+    """
+    speeds, distances = open_input_columns(input_path, raw_dtype)
+    rows = speeds.shape[0]
+    job = describe_job(input_path, output_path, rows, targets, raw_dtype)
+    start_row = load_checkpoint(output_path, job) if checkpoint_interval is not None else 0
+    if start_row:
+        out = open_output(output_path)
+    else:
+        out = create_output(output_path, rows, targets)
+    workspace = EquivalencyWorkspace(targets, capacity=chunk_size)
+
+    last_checkpoint = time.monotonic()
+    for start in range(start_row, rows, chunk_size):
+        stop = min(start + chunk_size, rows)
+        process_chunk(workspace, speeds, distances, out, start, stop)
+        release_pages(speeds)
+        release_pages(out)
+        if (checkpoint_interval is not None and stop < rows
+                and time.monotonic() - last_checkpoint >= checkpoint_interval):
+            out.flush()
+            save_checkpoint(output_path, job, stop)
+            last_checkpoint = time.monotonic()
+    out.flush()
+    if os.path.exists(checkpoint_path(output_path)):
+        os.remove(checkpoint_path(output_path))
+    return rows - start_row
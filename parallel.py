@@ -0,0 +1,152 @@
+"""Multi-core sharded batch engine
+
+Large input arrays are split into shards and computed by a process pool.
+Inputs and outputs live in multiprocessing.shared_memory blocks that every
+worker maps, so only block names and shard bounds are sent to workers and
+no array data is pickled. Each shard writes its own slice of the outputs
+with the same utils kernels as a serial run, so the result is identical to
+a serial run, row for row and bit for bit.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from utils import calculate_equivalency_matrix, validate_arrays
+
+# Shards per worker, so uneven shards still balance
+SHARDS_PER_WORKER = 4
+MIN_SHARD_SIZE = 65_536
+
+
+def _create_block(shape, dtype):
+    dtype = np.dtype(dtype)
+    size = max(int(np.prod(shape)) * dtype.itemsize, 1)
+    block = shared_memory.SharedMemory(create=True, size=size)
+    return block, np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+
+def _compute_shard(arrays, targets, start, stop):
+    _, codes = validate_arrays(arrays["speeds"][start:stop],
+                               arrays["distances"][start:stop])
+    arrays["codes"][start:stop] = codes
+    with np.errstate(divide="ignore", invalid="ignore"):
+        calculate_equivalency_matrix(arrays["speeds"][start:stop],
+                                     arrays["distances"][start:stop], targets,
+                                     out=arrays["speeds_out"][start:stop],
+                                     times_out=arrays["times"][start:stop])
+
+
+def _run_shard(specs, targets, start, stop):
+    """Worker task: compute rows [start, stop) in the shared blocks"""
+    # Workers share the parent's resource tracker, so the parent's unlink()
+    # also clears these registrations
+    blocks = {key: shared_memory.SharedMemory(name=name)
+              for key, (name, _, _) in specs.items()}
+    arrays = {key: np.ndarray(shape, dtype=dtype, buffer=blocks[key].buf)
+              for key, (_, shape, dtype) in specs.items()}
+    _compute_shard(arrays, targets, start, stop)
+    # Unmap before returning, so an idle worker doesn't keep a closed
+    # result's memory resident; the views have to go first
+    arrays.clear()
+    for block in blocks.values():
+        block.close()
+    return stop - start
+
+
+def _release(blocks):
+    for block in blocks:
+        block.close()
+        block.unlink()
+
+
+class ShardedResult:
+    """Outputs of ParallelEngine.run, backed by shared memory
+
+    codes, reaction_times and equivalent_speeds are views of the shared
+    blocks, so nothing is copied back from the workers; valid is a separate
+    array computed from codes in this process. Use as a context manager or
+    call close() to release the blocks; copy any shared arrays needed after
+    that.
+    """
+
+    def __init__(self, blocks, arrays):
+        self._blocks = blocks
+        self.codes = arrays["codes"]
+        self.valid = self.codes == 0
+        self.reaction_times = arrays["times"]
+        self.equivalent_speeds = arrays["speeds_out"]
+
+    def close(self):
+        self.codes = self.valid = self.reaction_times = self.equivalent_speeds = None
+        _release(self._blocks.values())
+        self._blocks = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ParallelEngine:
+    """Process pool that computes equivalency batches in shared-memory shards
+
+    Use as a context manager, or call close(), to shut the pool down. The
+    pool is reused across run() calls, so startup cost is paid once.
+    """
+
+    def __init__(self, workers=None):
+        self.workers = workers or os.cpu_count() or 1
+        self._pool = ProcessPoolExecutor(max_workers=self.workers)
+
+    def run(self, speeds, distances, targets, shard_size=None):
+        """Compute a batch and return a ShardedResult
+
+        Same values and order as validate_arrays plus a serial
+        calculate_equivalency_matrix over the whole batch.
+        """
+        speeds = np.asarray(speeds, dtype=float)
+        distances = np.asarray(distances, dtype=float)
+        targets = tuple(float(t) for t in targets)
+        rows = speeds.shape[0]
+        if shard_size is None:
+            shard_size = max(MIN_SHARD_SIZE,
+                             -(-rows // (self.workers * SHARDS_PER_WORKER)))
+
+        layout = {"speeds": ((rows,), np.float64),
+                  "distances": ((rows,), np.float64),
+                  "times": ((rows,), np.float64),
+                  "speeds_out": ((rows, len(targets)), np.float64),
+                  "codes": ((rows,), np.uint8)}
+        blocks, arrays = {}, {}
+        try:
+            for key, (shape, dtype) in layout.items():
+                blocks[key], arrays[key] = _create_block(shape, dtype)
+            arrays["speeds"][:] = speeds
+            arrays["distances"][:] = distances
+            specs = {key: (blocks[key].name, shape, np.dtype(dtype).str)
+                     for key, (shape, dtype) in layout.items()}
+            futures = [self._pool.submit(_run_shard, specs, targets, start,
+                                         min(start + shard_size, rows))
+                       for start in range(0, rows, shard_size)]
+            for future in futures:
+                future.result()
+        except BaseException:
+            arrays.clear()
+            _release(blocks.values())
+            raise
+        # Inputs are no longer needed once every shard has finished
+        del arrays["speeds"], arrays["distances"]
+        _release([blocks.pop("speeds"), blocks.pop("distances")])
+        return ShardedResult(blocks, arrays)
+
+    def close(self):
+        self._pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
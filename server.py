@@ -0,0 +1,335 @@
+"""Local HTTP JSON API for the equivalency calculations
+
+Run with: python server.py [--host 127.0.0.1] [--port 8000]
+
+A small asyncio HTTP/1.1 server (keep-alive, no dependencies beyond the
+standard library and NumPy) exposing the utils functions:
+
+    GET  /health
+    POST /reaction-time       {"speed": 60, "distance": 46}
+    POST /equivalent-speeds   {"target_time": 0.52, "distances": [42, 46]}
+                              or {"speed": 60, "distance": 46}; distances
+                              default to the chart's 15-60.5 ft grid
+    POST /validate            {"speed": 60, "distance": 46}
+    POST /batch               {"speeds": [...], "distances": [...],
+                               "targets": [42, 46]}
+
+    GET  /metrics             coalescer batch sizes and queueing delays
+
+Invalid input gets a 400 response with {"errors": [...]} using the same
+messages as the UI, and so do inputs whose results overflow a float;
+responses never contain NaN or Infinity. An unexpected error gets a 500
+response instead of a dropped connection. Concurrent /reaction-time and /equivalent-speeds
+requests (on the default grid) are coalesced into one NumPy call per batch
+window; see coalesce.py. See loadtest.py for measuring throughput and
+latency.
+"""
+import argparse
+import asyncio
+import functools
+import json
+import numbers
+import traceback
+
+import numpy as np
+
+from coalesce import MAX_BATCH, MAX_DELAY, Coalescer
+from utils import (PRESET_DISTANCES, calculate_equivalency_matrix,
+                   calculate_equivalent_speeds, calculate_reaction_time,
+                   error_messages, generate_distance_range, reaction_time,
+                   validate_arrays, validate_inputs)
+
+HOST = "127.0.0.1"
+PORT = 8000
+
+# Largest accepted request body, in bytes
+MAX_BODY = 16 * 1024 * 1024
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 413: "Payload Too Large",
+           431: "Request Header Fields Too Large", 500: "Internal Server Error"}
+
+# Error for valid inputs whose results overflow a float (e.g. a denormal speed)
+RESULT_OUT_OF_RANGE = "Result is out of range"
+
+
+def reaction_time_batch(items):
+    """Coalesced /reaction-time: one call for a list of (speed, distance)"""
+    speeds, distances = np.array(items, dtype=float).T
+    with np.errstate(divide="ignore", over="ignore"):
+        return calculate_reaction_time(speeds, distances).tolist()
+
+
+def equivalent_speeds_batch(target_times):
+    """Coalesced /equivalent-speeds: one row per target time on the default grid"""
+    targets = np.array(target_times, dtype=float)[:, np.newaxis]
+    with np.errstate(divide="ignore", over="ignore"):
+        return calculate_equivalent_speeds(targets, generate_distance_range()).tolist()
+
+
+def make_coalescers(max_delay=MAX_DELAY, max_batch=MAX_BATCH):
+    """Coalescers for the endpoints that batch single requests, keyed by name
+
+    Pass the result to dispatch (or serve); without it every request is
+    computed on its own.
+    """
+    return {
+        "reaction-time": Coalescer(reaction_time_batch, max_delay, max_batch),
+        "equivalent-speeds": Coalescer(equivalent_speeds_batch, max_delay, max_batch),
+    }
+
+
+class HTTPError(Exception):
+    def __init__(self, status, errors):
+        super().__init__(status, errors)
+        self.status = status
+        self.errors = errors if isinstance(errors, list) else [errors]
+
+
+def _validated(body):
+    speed, distance = body.get("speed"), body.get("distance")
+    errors = validate_inputs(speed, distance)
+    if errors:
+        raise HTTPError(400, errors)
+    return float(speed), float(distance)
+
+
+def _number_list(body, key, default=None):
+    """body[key] as a float array; 400 unless it is a list of finite numbers"""
+    values = body.get(key, default)
+    error = HTTPError(400, f"{key} must be a list of finite numbers")
+    if (not isinstance(values, list)
+            or not all(isinstance(v, numbers.Real) and not isinstance(v, bool)
+                       for v in values)):
+        raise error
+    try:
+        array = np.array(values, dtype=float)
+    except OverflowError:
+        raise error
+    if not np.isfinite(array).all():
+        raise error
+    return array
+
+
+def _target_time(body):
+    target_time = body["target_time"]
+    if isinstance(target_time, numbers.Real) and not isinstance(target_time, bool):
+        try:
+            target_time = float(target_time)
+        except OverflowError:
+            target_time = np.nan
+        if 0 < target_time < np.inf:
+            return target_time
+    raise HTTPError(400, "target_time must be a positive number")
+
+
+# Handlers take the parsed body and the coalescers (None when not coalescing)
+def handle_health(body, coalescers):
+    return {"status": "ok"}
+
+
+async def handle_reaction_time(body, coalescers):
+    speed, distance = _validated(body)
+    if coalescers:
+        return {"reaction_time": await coalescers["reaction-time"].submit((speed, distance))}
+    return {"reaction_time": reaction_time(speed, distance)}
+
+
+async def handle_equivalent_speeds(body, coalescers):
+    if "target_time" in body:
+        target_time = _target_time(body)
+    else:
+        target_time = reaction_time(*_validated(body))
+    if "distances" in body:
+        distances = _number_list(body, "distances")
+    else:
+        distances = generate_distance_range()
+        if coalescers:
+            return {"reaction_time": target_time,
+                    "distances": distances.tolist(),
+                    "equivalent_speeds":
+                        await coalescers["equivalent-speeds"].submit(target_time)}
+    with np.errstate(divide="ignore", over="ignore"):
+        equivalent_speeds = calculate_equivalent_speeds(target_time, distances)
+    return {"reaction_time": target_time,
+            "distances": distances.tolist(),
+            "equivalent_speeds": equivalent_speeds.tolist()}
+
+
+def handle_validate(body, coalescers):
+    errors = validate_inputs(body.get("speed"), body.get("distance"))
+    return {"valid": not errors, "errors": errors}
+
+
+def handle_batch(body, coalescers):
+    speeds = _number_list(body, "speeds")
+    distances = _number_list(body, "distances")
+    targets = _number_list(body, "targets", list(PRESET_DISTANCES))
+    if speeds.shape != distances.shape:
+        raise HTTPError(400, "speeds and distances must have the same length")
+    valid, codes = validate_arrays(speeds, distances)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        times = np.empty(speeds.size)
+        matrix = calculate_equivalency_matrix(speeds, distances, targets,
+                                              times_out=times)
+    in_range = np.isfinite(times) & np.isfinite(matrix).all(axis=1)
+    errors = [error_messages(code) if code or ok else [RESULT_OUT_OF_RANGE]
+              for code, ok in zip(codes, in_range)]
+    valid &= in_range
+    times_list, matrix_list = times.tolist(), matrix.tolist()
+    return {
+        "targets": targets.tolist(),
+        "valid": valid.tolist(),
+        "errors": errors,
+        "reaction_times": [t if ok else None for t, ok in zip(times_list, valid)],
+        "equivalent_speeds": [row if ok else None
+                              for row, ok in zip(matrix_list, valid)],
+    }
+
+
+def handle_metrics(body, coalescers):
+    return {name: coalescer.stats.snapshot()
+            for name, coalescer in (coalescers or {}).items()}
+
+
+ROUTES = {
+    "/health": ("GET", handle_health),
+    "/metrics": ("GET", handle_metrics),
+    "/reaction-time": ("POST", handle_reaction_time),
+    "/equivalent-speeds": ("POST", handle_equivalent_speeds),
+    "/validate": ("POST", handle_validate),
+    "/batch": ("POST", handle_batch),
+}
+
+
+def encode_json(response):
+    # allow_nan=False: NaN and Infinity are not valid JSON
+    return json.dumps(response, allow_nan=False).encode()
+
+
+async def dispatch(method, path, payload, coalescers=None):
+    """Return (status, JSON response body) for one request
+
+    coalescers (from make_coalescers), if given, batch concurrent single
+    requests. Errors in a handler get a 500 response rather than dropping
+    the connection.
+    """
+    route = ROUTES.get(path.split("?", 1)[0])
+    try:
+        if route is None:
+            raise HTTPError(404, f"No endpoint {path}")
+        allowed, handler = route
+        if method != allowed:
+            raise HTTPError(405, f"{path} only accepts {allowed}")
+        body = {}
+        if payload:
+            try:
+                body = json.loads(payload)
+            except ValueError:
+                raise HTTPError(400, "Request body must be valid JSON")
+            if not isinstance(body, dict):
+                raise HTTPError(400, "Request body must be a JSON object")
+        response = handler(body, coalescers)
+        if asyncio.iscoroutine(response):
+            response = await response
+        try:
+            return 200, encode_json(response)
+        except ValueError:
+            raise HTTPError(400, RESULT_OUT_OF_RANGE)
+    except HTTPError as e:
+        return e.status, encode_json({"errors": e.errors})
+    except Exception:
+        traceback.print_exc()
+        return 500, encode_json({"errors": ["Internal server error"]})
+
+
+def encode_response(status, body, keep_alive):
+    head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode() + body
+
+
+async def read_request(reader):
+    """Return (method, path, keep_alive, body), or None when the client hangs up"""
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return None
+    except asyncio.LimitOverrunError:
+        raise HTTPError(431, "Request header too large")
+    lines = head.decode("latin-1").split("\r\n")
+    method, path, version = lines[0].split(" ", 2)
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", 0))
+    if length < 0:
+        raise ValueError("Negative Content-Length")
+    if length > MAX_BODY:
+        raise HTTPError(413, "Request body too large")
+    body = await reader.readexactly(length) if length else b""
+    keep_alive = (headers.get("connection", "").lower() != "close"
+                  and version == "HTTP/1.1")
+    return method, path, keep_alive, body
+
+
+async def handle_connection(reader, writer, coalescers=None):
+    try:
+        while True:
+            try:
+                request = await read_request(reader)
+            except HTTPError as e:
+                writer.write(encode_response(e.status, encode_json({"errors": e.errors}),
+                                             False))
+                break
+            except ValueError:
+                writer.write(encode_response(
+                    400, encode_json({"errors": ["Malformed HTTP request"]}), False))
+                break
+            if request is None:
+                break
+            method, path, keep_alive, body = request
+            status, response = await dispatch(method, path, body, coalescers)
+            writer.write(encode_response(status, response, keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host=HOST, port=PORT, coalescers=None):
+    server = await asyncio.start_server(
+        functools.partial(handle_connection, coalescers=coalescers), host, port)
+    print(f"Serving on http://{host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--max-delay-us", type=float, default=MAX_DELAY * 1e6,
+                        help="longest a request waits for its batch to fill")
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH,
+                        help="requests per coalesced batch")
+    parser.add_argument("--no-coalesce", action="store_true",
+                        help="compute every request on its own")
+    args = parser.parse_args()
+    coalescers = (None if args.no_coalesce
+                  else make_coalescers(args.max_delay_us / 1e6, args.max_batch))
+    try:
+        asyncio.run(serve(args.host, args.port, coalescers))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
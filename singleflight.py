@@ -0,0 +1,63 @@
+"""Single-flight deduplication of identical in-flight computations
+
+When several threads (Streamlit sessions) ask for the same key at the same
+time, only the first runs the computation; the others wait for it and get
+the same result, or the same exception. Nothing is cached: once the
+computation finishes, the next call for that key runs it again.
+"""
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Merge concurrent calls with the same key into one execution
+
+    Counters: calls made, executions actually run, and saved (calls that
+    shared another call's execution).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.calls = 0
+        self.executions = 0
+        self.saved = 0
+
+    def do(self, key, func, *args, **kwargs):
+        """Return func(*args, **kwargs), shared with any in-flight call for key"""
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                self.saved += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def stats(self):
+        with self._lock:
+            return {"calls": self.calls, "executions": self.executions,
+                    "saved": self.saved, "in_flight": len(self._calls)}
@@ -0,0 +1,79 @@
+"""Batched inverse solver for flight time models
+
+Finds, for every element of a batch at once, the release speed whose flight
+time matches a target time. Any model works as long as flight time falls as
+speed rises; the closed form in utils doesn't need this, but the drag model
+in drag.py does.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+SolveResult = namedtuple("SolveResult", ["speeds", "converged", "iterations"])
+
+# Speed bracket (mph) searched when the caller doesn't provide one
+LOWER_SPEED = 1.0
+UPPER_SPEED = 500.0
+
+
+def solve_speeds(flight_time, target_time, distances, initial=None,
+                 lower=LOWER_SPEED, upper=UPPER_SPEED, tolerance=1e-10,
+                 max_iterations=50, derivative_step=1e-6):
+    """Solve flight_time(speed, distance) == target_time for speed, elementwise
+
+    target_time and distances broadcast against each other, so a column of
+    target times and a row of distances solves a whole batch of curves in one
+    call. Each iteration takes a Newton step using a forward-difference
+    derivative (evaluated in the same call as the function) and falls back
+    to bisection whenever the step leaves the bracket. Elements stop once
+    their relative time error is below tolerance; only unconverged elements
+    are evaluated on later iterations.
+
+    Returns a SolveResult of (speeds, converged mask, per-element iteration
+    counts), all shaped like the broadcast inputs.
+    """
+    target_time, distances = np.broadcast_arrays(
+        np.asarray(target_time, dtype=float), np.asarray(distances, dtype=float))
+    shape = target_time.shape
+    target = target_time.ravel()
+    dist = distances.ravel()
+
+    if initial is None:
+        # Constant-speed answer is a good starting point for any model
+        initial = (distances / target_time) / 1.467
+    speeds = np.clip(np.broadcast_to(initial, shape).astype(float).ravel(),
+                     lower, upper)
+    lo = np.full(speeds.shape, float(lower))
+    hi = np.full(speeds.shape, float(upper))
+    converged = np.zeros(speeds.shape, dtype=bool)
+    iterations = np.zeros(speeds.shape, dtype=np.int64)
+
+    active = np.arange(speeds.size)
+    for _ in range(max_iterations):
+        if active.size == 0:
+            break
+        v, d, t = speeds[active], dist[active], target[active]
+        h = derivative_step * v
+        times = flight_time(np.concatenate([v, v + h]), np.concatenate([d, d]))
+        error = times[:active.size] - t
+        slope = (times[active.size:] - times[:active.size]) / h
+        iterations[active] += 1
+
+        done = np.abs(error) <= tolerance * t
+        converged[active[done]] = True
+
+        # Flight time falls with speed: too slow means a positive error
+        too_slow = error > 0
+        lo[active] = np.where(too_slow, v, lo[active])
+        hi[active] = np.where(too_slow, hi[active], v)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = v - error / slope
+        a, b = lo[active], hi[active]
+        outside = ~((step > a) & (step < b))
+        speeds[active] = np.where(done, v,
+                                  np.where(outside, 0.5 * (a + b), step))
+        active = active[~done]
+
+    return SolveResult(speeds.reshape(shape), converged.reshape(shape),
+                       iterations.reshape(shape))
@@ -0,0 +1,68 @@
+"""Chebyshev surrogate coefficients, generated by fit_surrogate.py -- do not edit"""
+
+FLIGHT_TIME_DOMAIN = ((20, 110), (15.0, 60.5))
+EQUIVALENT_SPEED_DOMAIN = ((4.0, 450.0), (15.0, 60.5))
+
+FLIGHT_TIME_COEFFICIENTS = [
+    [1.0441385071161575, 0.027422486343194153, 0.0003119515493361516, 3.1736067622736494e-06, 2.6161399420822178e-08, 3.88416868113417e-11, -7.22625897921908e-12],
+    [-0.011715517758569768, -0.00725655483463426, -6.92753417184459e-05, 1.0907001832113558e-06, 2.8780991664575928e-08, -8.31257502068028e-12, -1.5547377621438763e-11],
+    [-0.0023904993840899664, -0.0016469555687740772, -7.587775794230638e-05, 1.5018132406945106e-07, 4.1864586779443574e-08, 4.2790378879109525e-10, -1.4609066994325515e-11],
+    [0.0015490529854801979, 0.0008641631456977254, -2.918689677387353e-05, -1.1722920018313737e-06, 2.4803992315376028e-08, 1.2142190158057412e-09, -6.129406877886101e-13],
+    [0.0009025964417430155, 0.0005962914538346685, 1.6342624262510094e-05, -1.0690072543758375e-06, -2.2343194093499275e-08, 1.1947663922659904e-09, 3.4067666439610567e-11],
+    [-0.00017177335599120403, -5.540685707803035e-05, 1.8451387340575687e-05, 1.3472164332980542e-07, -3.992443067417145e-08, -2.8433483031161527e-10, 5.141005675029088e-11],
+    [-0.00026714333772203183, -0.0001646449215675848, 6.147103776832363e-07, 6.560306855148812e-07, -7.0223735612303176e-09, -1.4565686681962398e-09, 7.574686104044881e-12],
+    [-1.8273154387378823e-05, -2.9563459323938288e-05, -6.457843888249722e-06, 1.995201114285243e-07, 2.303971153867334e-08, -6.84515519570536e-10, -5.1810978250743656e-11],
+    [6.432756735331654e-05, 3.468552261323937e-05, -2.288715185042294e-06, -2.3082304803135646e-07, 1.4477600089905437e-08, 7.418834364111143e-10, -4.2358553080032446e-11],
+    [1.9908602850020676e-05, 1.7167628500444404e-05, 1.4868841827935832e-06, -1.6829094440419133e-07, -6.850173307065832e-09, 8.314347328024566e-10, 1.9515172653859422e-11],
+    [-1.1902896104912762e-05, -4.413073156524878e-06, 1.2178845282755741e-06, 4.0223604117677145e-08, -1.0106839550168278e-08, -1.0245802622120548e-10, 4.2802503579767066e-11],
+    [-8.03020530024904e-06, -5.786823201940454e-06, -1.207847642259799e-07, 8.110134061398893e-08, -3.1662571634114185e-10, -5.336083547680809e-10, 6.5900319055900436e-12],
+    [1.1469288180169027e-06, -4.470633074558396e-07, -4.3146575009816654e-07, 1.022285500305517e-08, 4.624519397847596e-09, -1.5232414700243335e-10, -2.5239096674168487e-11],
+    [2.374285237101599e-06, 1.4305269194130684e-06, -9.041125568207738e-08, -2.775288783680996e-08, 1.7257696116341342e-09, 2.2508600322143635e-10, -1.469362587332157e-11],
+    [2.8709336048586553e-07, 5.301109778249624e-07, 1.1042561556243082e-07, -1.2529935800725811e-08, -1.438503325137952e-09, 1.5945748107343283e-10, 8.883387948854793e-12],
+    [-5.495516847633269e-07, -2.3677508042592313e-07, 6.17174520632386e-08, 6.2843226482020564e-09, -1.2084091193575249e-09, -5.299785263424006e-11, 1.167368111898437e-11],
+    [-2.132537136219359e-07, -2.136539111936321e-07, -1.622688942893788e-08, 6.485892778472328e-09, 1.993991087696767e-10, -9.383142906323888e-11, -3.6267299927117413e-13],
+]
+
+EQUIVALENT_SPEED_COEFFICIENTS = [
+    [1.0367638181591208, 0.02259515583084192, 0.00016432252789914828, 8.612430717788548e-07, 3.141077242817085e-09, 1.797966788473493e-11, 1.180973667382762e-12, 5.369225029860925e-13, -9.245284998183646e-13],
+    [-0.009875507865182789, -0.006181905684274761, -8.663796314093233e-05, -6.146874242747482e-07, -2.355438040359953e-09, -1.7048276093785397e-11, -2.3215580933350077e-12, -1.0176922238952502e-12, 1.7287022507916916e-12],
+    [0.006696050731345948, 0.004215514966837574, 6.792975971962135e-05, 5.508595365740637e-07, 2.5839183566780423e-09, 1.4861402039545446e-12, 2.0950812699288557e-12, 7.983405603262383e-13, -1.429713986089709e-12],
+    [-0.002846933853334178, -0.001825359919473996, -4.172199891212813e-05, -4.659602919752275e-07, -3.0615497229394273e-09, 9.607957441801207e-12, -1.6356974097669202e-12, -3.6763216711317714e-13, 1.0919139941181766e-12],
+    [-0.0002817041201898622, -0.00013342563047773984, 1.4414063296817956e-05, 3.611080284274498e-07, 3.660358392906446e-09, -5.4703677568671005e-12, 9.420131233221773e-13, -2.4198779915649005e-13, -8.231498165381379e-13],
+    [0.0018366762711927802, 0.001128476509634308, 7.345294358405887e-06, -2.181337740874193e-07, -3.9263729929568496e-09, -1.4852060214814132e-11, -1.5857281613284539e-13, 8.446881432158659e-13, 6.171939858062164e-13],
+    [-0.0017994952239819809, -0.0011357434916909519, -1.8823443466732905e-05, 2.858169064981096e-08, 3.2467273713282507e-09, 4.124574737741221e-11, -4.5116081009988207e-13, -1.158998461439631e-12, -3.744132553908791e-13],
+    [0.000820170989322, 0.0005443651011267184, 1.896230044254088e-05, 1.7290063846698753e-07, -1.2896864395655835e-09, -5.750551730220217e-11, 6.379091590895392e-13, 9.64277973875688e-13, 6.969143144519574e-15],
+    [0.00024794261483121027, 0.00012269109381757344, -1.0740159452688163e-05, -3.09476280845912e-07, -1.5610655682615077e-09, 4.952425161587268e-11, -3.402776107760963e-13, -2.6989033837659937e-13, 4.5118710200256484e-13],
+    [-0.0008079921177411072, -0.0004899938518395416, -2.5438543979668517e-07, 3.0791086727587416e-07, 4.160661424006291e-09, -1.3450318658327076e-11, -2.2265793809400636e-13, -6.344515977039014e-13, -8.20732980817869e-13],
+    [0.0007323640311839709, 0.0004653807964563608, 8.424650812128079e-06, -1.5726537559533757e-07, -5.125931743024399e-09, -3.9397866804895265e-11, 6.386831168103679e-13, 1.3022937491845993e-12, 8.81589126786736e-13],
+    [-0.0002762350445293389, -0.000194660555169673, -1.0610402535930676e-05, -6.841218886635865e-08, 3.690501484461149e-09, 8.446025855698286e-11, -5.467385441951245e-13, -1.3702242330137712e-12, -5.333937501753039e-13],
+    [-0.00018253453214368788, -9.26435599861593e-05, 7.121385491185348e-06, 2.4704849401545694e-07, -3.347376985513885e-10, -9.465978847799207e-11, -9.70255573475888e-14, 7.746734297878893e-13, -9.764194661143755e-14],
+    [0.0003883530682154781, 0.00023365276842014256, -9.459282248073863e-07, -2.82521394966693e-07, -3.3054951670117736e-09, 5.6552237529374286e-11, 9.279325354979995e-13, 1.943754402225495e-13, 6.974417788088716e-13],
+    [-0.00030917838296197595, -0.00019903346374239208, -4.240650031186728e-06, 1.640519791210353e-07, 5.29566103761505e-09, 1.7494537827948686e-11, -1.35789350006214e-12, -1.0429386727747432e-12, -9.37873842715535e-13],
+    [8.233485500360686e-05, 6.573478053898698e-05, 6.059241898719958e-06, 2.9900633233162326e-08, -4.533425416097456e-09, -9.115884623219807e-11, 9.612976647338511e-13, 1.3456399623051896e-12, 6.80807081716861e-13],
+    [0.0001167302758100959, 5.998674346620266e-05, -4.367117992708398e-06, -1.8403890013714345e-07, 1.4353369901594533e-09, 1.2249405011372297e-10, 1.8839964310846113e-13, -9.807041788899296e-13, -7.470630017381019e-14],
+    [-0.00018512325710776166, -0.00011093578094965384, 8.512860051285522e-07, 2.1761779006219148e-07, 2.278362821973509e-09, -8.938033337546267e-11, -1.4802180748479943e-12, 1.8469806709494983e-13, -5.272092441430121e-13],
+    [0.00012691757590568235, 8.350900978795788e-05, 2.2477551284681447e-06, -1.2811985197188963e-07, -4.582736179252478e-09, 5.748717989270333e-12, 2.09708010505405e-12, 5.9658495591558e-13, 7.805915202413471e-13],
+    [-1.621425592069378e-05, -1.88477838054794e-05, -3.427325978939391e-06, -1.6918753526011217e-08, 4.314173504305378e-09, 8.36070337311215e-11, -1.535856511414302e-12, -9.679593823523625e-13, -5.604130440955979e-13],
+    [-6.740414622577874e-05, -3.478822049647617e-05, 2.539341088581503e-06, 1.2856071634005423e-07, -1.7944121518537193e-09, -1.2827979737478623e-10, -1.6345648792825962e-14, 8.006699144837148e-13, 3.3032170748681366e-14],
+    [8.561164810365319e-05, 5.126135084761055e-05, -5.519486214032739e-07, -1.5072414817353082e-07, -1.4374307308133959e-09, 1.0248430066823327e-10, 1.7233023818716275e-12, -2.7506339220217946e-13, 4.562389962353697e-13],
+    [-4.955619778714438e-05, -3.380100026344288e-05, -1.22459868427086e-06, 8.689231762132148e-08, 3.57639045125719e-09, -2.1080052959275564e-11, -2.570151068966714e-12, -2.588213660319888e-13, -6.061605210827548e-13],
+    [-2.602956194064452e-06, 3.4463867629807394e-06, 1.9115425163559384e-06, 1.2034801846733502e-08, -3.5830025448067414e-09, -6.90856066473157e-11, 1.9882865969975128e-12, 5.05802648029241e-13, 3.4747226797249287e-13],
+    [3.61208177621984e-05, 1.8620757082528404e-05, -1.421461914970668e-06, -8.501010814206253e-08, 1.6901198681687143e-09, 1.1721593964550414e-10, -2.395520576608384e-13, -3.9069141259846785e-13, 1.2646806345217865e-13],
+    [-3.820565624623176e-05, -2.2933165946851033e-05, 3.101881382068759e-07, 9.709945826753179e-08, 8.583241578965541e-10, -9.843512366569359e-11, -1.701005222093377e-12, 7.148882180674221e-14, -4.951479764397915e-13],
+    [1.8045750979698086e-05, 1.3085109580858196e-05, 6.777069082474678e-07, -5.4015690880327046e-08, -2.60938523939548e-09, 2.719365630300761e-11, 2.7092755122692935e-12, 1.9202301267583156e-13, 5.222020732498223e-13],
+    [5.624117265273527e-06, 6.67314468494585e-07, -1.051805443172689e-06, -9.199017454784679e-09, 2.7282591161833895e-09, 5.321182861337372e-11, -2.1894158036030176e-12, -2.2023789042480146e-13, -2.0116807525338842e-13],
+    [-1.8273125987599333e-05, -9.370321823408932e-06, 7.726302345323257e-07, 5.372681686740058e-08, -1.3791669675874627e-09, -9.74477874153383e-11, 4.3760665664055454e-13, 2.0820611944596945e-14, -2.530412945150884e-13],
+    [1.641012363659631e-05, 9.91847338931227e-06, -1.5796350222700988e-07, -5.9338578405174376e-08, -4.991038749825594e-10, 8.426686822285423e-11, 1.5284353914891274e-12, 2.3404715665531484e-13, 5.515238331137151e-13],
+    [-5.907029204011913e-06, -4.7955053835339965e-06, -3.7818571803707474e-07, 3.160063383547424e-08, 1.8172349646665246e-09, -2.6576979115719435e-11, -2.5782030590310034e-12, -3.3841842089071816e-13, -5.154758998121567e-13],
+    [-4.4282954060823054e-06, -1.2151476338021232e-06, 5.714680040862143e-07, 6.872645709205937e-09, -1.9543683512558848e-09, -3.909790958871173e-11, 2.1381748368382025e-12, 1.962180418146886e-13, 1.7959800855706087e-13],
+    [8.812874716840162e-06, 4.479679381132456e-06, -4.096414158595964e-07, -3.271069130630368e-08, 1.026936668297937e-09, 7.569341518593592e-11, -5.162993513621594e-13, 1.171193133794879e-13, 2.4600341295283323e-13],
+    [-6.756488679419184e-06, -4.1404586853470535e-06, 7.327622888100697e-08, 3.4824781256197895e-08, 2.904219393185664e-10, -6.656533516665591e-11, -1.3074428692472218e-12, -4.092333026270434e-13, -5.16611493167618e-13],
+    [1.5757740830669303e-06, 1.6355280340294519e-06, 2.1160319174835535e-07, -1.7661421914522395e-08, -1.2233974648221888e-09, 2.2470992514650456e-11, 2.282096224232727e-12, 4.968152625406397e-13, 4.988976625482783e-13],
+    [2.754459619964695e-06, 8.95695379510373e-07, -3.066894517060061e-07, -4.879294449882288e-09, 1.3371614347734446e-09, 2.7822543097535957e-11, -1.903769947676076e-12, -3.1996009574458695e-13, -2.3365548862050445e-13],
+    [-4.0723753365785875e-06, -2.0452900747701985e-06, 2.1230944963035974e-07, 1.9300489161413505e-08, -7.159101408481944e-10, -5.5932785096232673e-11, 4.809288411304971e-13, -2.4817604568627694e-14, -1.1097362178497105e-13],
+    [2.6463682527092794e-06, 1.6638144307843153e-06, -3.025105442045536e-08, -1.978937698210231e-08, -1.7319102011900678e-10, 4.963124561937343e-11, 1.0964702453278297e-12, 3.505975891548996e-13, 3.5278507545810633e-13],
+    [-2.0753993167522272e-07, -5.02237669671788e-07, -1.1815205888981355e-07, 9.520328338771377e-09, 8.024931363957016e-10, -1.7389833605226113e-11, -1.9148929268414036e-12, -4.924910305958985e-13, -3.969684823912356e-13],
+    [-1.522920610600234e-06, -5.220312216170676e-07, 1.6254885034297094e-07, 3.285208748023431e-09, -8.821734342372503e-10, -1.9303754565148674e-11, 1.572187069117173e-12, 3.971216259480992e-13, 2.6607454304064526e-13],
+    [1.805918503081658e-06, 8.932677358665782e-07, -1.0763959610159027e-07, -1.1086705690543756e-08, 4.741824699821401e-10, 3.9776186467818664e-11, -3.7193116425235373e-13, -1.393933796514646e-13, -5.945092508563565e-14],
+]
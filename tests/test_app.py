@@ -0,0 +1,98 @@
+import json
+import os
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+import drag
+import figures
+from utils import quantize_inputs
+
+MAIN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+
+
+def run_app(stats=False):
+    app = AppTest.from_file(MAIN, default_timeout=30)
+    if stats:
+        app.query_params["stats"] = ""
+    return app.run()
+
+
+def flight_stats(app):
+    return json.loads(app.sidebar.json[0].value)
+
+
+@pytest.mark.parametrize("speed, distance, expected", [
+    (60, 46.0, (60, 46.0)),
+    (60.4, 46.2, (60, 46.0)),
+    (59.6, 46.3, (60, 46.5)),
+    (80.0, 54, (80, 54.0)),
+])
+def test_quantize_inputs_snaps_to_slider_steps(speed, distance, expected):
+    key = quantize_inputs(speed, distance)
+    assert key == expected
+    assert type(key[0]) is int and type(key[1]) is float
+
+
+def test_app_renders_the_default_chart():
+    app = run_app()
+    assert not app.exception
+    assert app.info[0].value.endswith("Reaction Time: 0.523 seconds")
+    assert len(app.get("plotly_chart")) == 1
+
+
+def count_calls(monkeypatch, module, name):
+    calls = []
+    original = getattr(module, name)
+
+    def counted(*args, **kwargs):
+        calls.append(args)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(module, name, counted)
+    return calls
+
+
+def test_reruns_reuse_cached_curves_and_figures(monkeypatch):
+    app = run_app(stats=True)
+    app.toggle[0].set_value(True).run()
+    app.toggle[0].set_value(False).run()
+    before = flight_stats(app)
+    # main.py imports these on every run, so it picks up the counted versions
+    builds = count_calls(monkeypatch, figures, "build_figure")
+    solves = count_calls(monkeypatch, drag, "calculate_flight_time")
+    # Drag, then no drag again: both are cached by now
+    app.toggle[0].set_value(True).run()
+    app.toggle[0].set_value(False).run()
+    assert not app.exception
+    assert builds == [] and solves == []
+    # Every lookup still goes through the flights, which sit in front of the caches
+    after = flight_stats(app)
+    assert after["curve"]["calls"] == before["curve"]["calls"] + 2
+    assert after["figure"]["calls"] == before["figure"]["calls"] + 2
+
+
+def test_browser_chart_replaces_the_page_sliders():
+    app = run_app()
+    assert len(app.slider) == 2
+    app.radio(key="chart_mode").set_value("In the browser").run()
+    assert not app.exception
+    assert len(app.slider) == 0
+    assert not app.info
+    # With air drag the browser chart is unavailable and the sliders return
+    app.toggle(key="use_drag").set_value(True).run()
+    assert len(app.slider) == 2
+    assert len(app.get("plotly_chart")) == 1
+
+
+def test_frame_modes_use_their_own_flight():
+    app = run_app(stats=True)
+    app.selectbox(key="preset_selector").set_value("HS (80 mph @ 54.0 ft)").run()
+    before = flight_stats(app)
+    assert set(before) == {"curve", "figure", "animation"}
+    app.radio(key="chart_mode").set_value("Distance frames").run()
+    assert not app.exception
+    assert not app.info
+    after = flight_stats(app)
+    assert after["animation"]["calls"] == before["animation"]["calls"] + 1
+    assert after["figure"] == before["figure"]
@@ -0,0 +1,98 @@
+import argparse
+import csv
+import io
+import sys
+
+import pytest
+
+import batch
+from utils import calculate_equivalent_speeds, calculate_reaction_time
+
+ROSTER = """Player,Speed,Distance,Team
+Avery,60,46,Blue
+Blake,bad,46
+Casey,80,70,Red
+
+Drew,95,54.0,Red
+"""
+
+
+def run_csv(text, targets=(42.0, 54.0), chunk_size=2):
+    stdin = io.StringIO(text)
+    output = io.StringIO()
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(sys, "stdin", stdin)
+        rows = batch.run_csv(["-"], output, list(targets), chunk_size)
+    return rows, list(csv.reader(io.StringIO(output.getvalue())))
+
+
+def test_csv_rows_and_errors():
+    rows, table = run_csv(ROSTER)
+    assert rows == 4
+    assert table[0] == ["player", "speed", "distance", "reaction_time",
+                        "speed_at_42ft", "speed_at_54ft", "error"]
+    avery = table[1]
+    time = calculate_reaction_time(60.0, 46.0)
+    assert avery[:4] == ["Avery", "60", "46", f"{time:.4f}"]
+    assert avery[4] == f"{calculate_equivalent_speeds(time, 42.0):.2f}"
+    assert avery[6] == ""
+    assert table[2][3:] == ["", "", "", "Speed must be a positive number"]
+    assert table[3][6] == "Distance must be between 15 and 60.5 feet"
+    assert table[4][0] == "Drew" and table[4][6] == ""
+
+
+def test_chunk_size_does_not_change_the_output():
+    assert run_csv(ROSTER, chunk_size=1) == run_csv(ROSTER, chunk_size=1000)
+
+
+def test_overflowing_rows_are_out_of_range():
+    _, table = run_csv("player,speed,distance\nTiny,1e-320,46\nAvery,60,46\n")
+    assert table[1] == ["Tiny", "1e-320", "46", "", "", "", batch.RESULT_OUT_OF_RANGE]
+    assert table[2][6] == ""
+
+
+def test_missing_columns_are_reported():
+    with pytest.raises(ValueError, match="player, speed and distance"):
+        run_csv("name,speed\nA,60\n")
+
+
+def test_parse_targets_drops_repeats():
+    assert batch.parse_targets("42,46, 42.0,,54,46") == [42.0, 46.0, 54.0]
+
+
+@pytest.mark.parametrize("text", ["42,x", "inf", "42,nan"])
+def test_parse_targets_rejects_bad_distances(text):
+    with pytest.raises(argparse.ArgumentTypeError):
+        batch.parse_targets(text)
+
+
+def test_main_reports_bad_input_in_one_line(tmp_path, monkeypatch, capsys):
+    path = tmp_path / "roster.csv"
+    path.write_text("name,speed\nA,60\n")
+    monkeypatch.setattr(sys, "argv", ["batch.py", "csv", str(path),
+                                      "-o", str(tmp_path / "out.csv")])
+    with pytest.raises(SystemExit) as exit_info:
+        batch.main()
+    assert exit_info.value.code == 2
+    assert capsys.readouterr().err == (
+        "batch.py: error: CSV input needs player, speed and distance columns\n")
+
+
+def test_main_accepts_repeated_targets(tmp_path, monkeypatch):
+    path = tmp_path / "roster.csv"
+    path.write_text(ROSTER)
+    out = tmp_path / "out.csv"
+    monkeypatch.setattr(sys, "argv", ["batch.py", "csv", str(path), "-o", str(out),
+                                      "--targets", "42,42,46"])
+    batch.main()
+    assert out.read_text().splitlines()[0] == (
+        "player,speed,distance,reaction_time,speed_at_42ft,speed_at_46ft,error")
+
+
+@pytest.mark.parametrize("size", ["0", "-3", "x"])
+def test_chunk_size_must_be_positive(monkeypatch, capsys, size):
+    monkeypatch.setattr(sys, "argv", ["batch.py", "csv", "--chunk-size", size])
+    with pytest.raises(SystemExit) as exit_info:
+        batch.main()
+    assert exit_info.value.code == 2
+    assert "must be a positive integer" in capsys.readouterr().err
@@ -0,0 +1,69 @@
+import io
+import json
+
+import pytest
+
+import batch
+from utils import calculate_equivalent_speeds, calculate_reaction_time
+
+TARGETS = [42.0, 46.0]
+
+
+def run(lines, max_batch=4):
+    output = io.StringIO()
+    count = batch.run_ndjson(io.StringIO("".join(line + "\n" for line in lines)),
+                             output, TARGETS, max_batch, 0.001)
+    results = [json.loads(line) for line in output.getvalue().splitlines()]
+    return count, results
+
+
+def test_results_in_input_order():
+    requests = [{"id": i, "speed": 40 + i, "distance": 46} for i in range(10)]
+    count, results = run([json.dumps(r) for r in requests], max_batch=3)
+    assert count == 10
+    assert [r["id"] for r in results] == list(range(10))
+    time = calculate_reaction_time(45, 46)
+    assert results[5]["reaction_time"] == time
+    assert results[5]["equivalent_speeds"] == {
+        "42": calculate_equivalent_speeds(time, 42.0),
+        "46": calculate_equivalent_speeds(time, 46.0)}
+
+
+def test_per_request_targets():
+    _, results = run(['{"speed": 60, "distance": 46, "targets": [20, 54.5]}'])
+    assert list(results[0]["equivalent_speeds"]) == ["20", "54.5"]
+
+
+def test_blank_lines_are_skipped():
+    count, results = run(['{"id": 1, "speed": 60, "distance": 46}', "", "   ",
+                          '{"id": 2, "speed": 60, "distance": 46}'])
+    assert count == 2
+    assert [r["id"] for r in results] == [1, 2]
+
+
+@pytest.mark.parametrize("line, errors", [
+    ("not json", ["Request must be a JSON object"]),
+    ("[1, 2]", ["Request must be a JSON object"]),
+    ('{"id": 1, "speed": "60", "distance": 46}', ["Speed must be a positive number"]),
+    ('{"id": 1, "speed": 1' + "0" * 400 + ', "distance": 46}',
+     ["Speed must be a positive number"]),
+    ('{"id": 1, "speed": 1e999, "distance": 46}', ["Speed must be a positive number"]),
+    ('{"id": 1, "speed": true, "distance": 46}', ["Speed must be a positive number"]),
+    ('{"id": 1, "speed": 60, "distance": 46, "targets": "42"}',
+     ["Targets must be a list of distances"]),
+    ('{"id": 1, "speed": 60, "distance": 46, "targets": [42, 1e999]}',
+     ["Targets must be a list of distances"]),
+    ('{"id": 1, "speed": 60, "distance": 46, "targets": [42, "46"]}',
+     ["Targets must be a list of distances"]),
+    ('{"id": 1, "speed": 1e-320, "distance": 46}', ["Result is out of range"]),
+    ('{"id": 1e999, "speed": 60, "distance": 46}', [batch.INVALID_ID]),
+    ('{"id": NaN, "speed": 60, "distance": 46}', [batch.INVALID_ID]),
+    ('{"id": {"x": -Infinity}, "speed": 1e-320, "distance": 46}', [batch.INVALID_ID]),
+])
+@pytest.mark.filterwarnings("error")
+def test_bad_lines_get_an_error_without_stopping_the_batch(line, errors):
+    good = '{"id": 2, "speed": 60, "distance": 46}'
+    count, results = run([good, line, good])
+    assert count == 3
+    assert results[1]["errors"] == errors
+    assert results[0] == results[2] and "reaction_time" in results[0]
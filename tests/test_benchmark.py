@@ -0,0 +1,29 @@
+import json
+
+import numpy as np
+
+import benchmark
+from utils import calculate_reaction_time
+
+
+def test_run_chunked_matches_one_call(monkeypatch):
+    monkeypatch.setattr(benchmark, "CHUNK_ROWS", 1000)
+    speeds, distances = benchmark.make_roster(2500)
+    np.testing.assert_array_equal(
+        benchmark.run_chunked(calculate_reaction_time, speeds, distances),
+        calculate_reaction_time(speeds, distances))
+
+
+def test_engine_results_and_baseline_comparison(tmp_path, capsys):
+    results = benchmark.bench_engines(["closed_form", "drag_surrogate"], ["grid"])
+    assert [r["engine"] for r in results] == ["closed_form", "drag_surrogate"]
+    for result in results:
+        assert result["rows"] == 92
+        assert result["p50_ms"] <= result["p99_ms"]
+    # The closed form ignores drag entirely; the surrogate tracks it
+    assert results[1]["max_error_s"] < 1e-6 < results[0]["max_error_s"]
+
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps({"results": results}))
+    benchmark.compare_to_baseline(results, str(baseline))
+    assert "+0.0%" in capsys.readouterr().out
@@ -0,0 +1,77 @@
+import os
+
+import numpy as np
+import pytest
+
+import outofcore
+
+TARGETS = [42.0, 54.0]
+
+
+class Interrupted(Exception):
+    pass
+
+
+@pytest.fixture
+def pitches(tmp_path):
+    rng = np.random.default_rng(1)
+    path = str(tmp_path / "pitches.npy")
+    np.save(path, np.column_stack([rng.uniform(0, 120, 5000),
+                                   rng.uniform(10, 65, 5000)]))
+    return path
+
+
+def interrupt_after(monkeypatch, chunks):
+    process_chunk = outofcore.process_chunk
+    done = []
+
+    def failing(*args):
+        if len(done) == chunks:
+            raise Interrupted
+        process_chunk(*args)
+        done.append(args[4])
+    monkeypatch.setattr(outofcore, "process_chunk", failing)
+
+
+def test_resumed_run_is_byte_identical(tmp_path, pitches, monkeypatch):
+    fresh = str(tmp_path / "fresh.npy")
+    outofcore.run_memmap(pitches, fresh, TARGETS, chunk_size=500)
+
+    resumed = str(tmp_path / "resumed.npy")
+    with monkeypatch.context() as patch:
+        interrupt_after(patch, 4)
+        with pytest.raises(Interrupted):
+            outofcore.run_memmap(pitches, resumed, TARGETS, chunk_size=500,
+                                 checkpoint_interval=0)
+    assert os.path.exists(outofcore.checkpoint_path(resumed))
+
+    rows = outofcore.run_memmap(pitches, resumed, TARGETS, chunk_size=500,
+                                checkpoint_interval=0)
+    assert rows == 5000 - 2000
+    assert not os.path.exists(outofcore.checkpoint_path(resumed))
+    with open(fresh, "rb") as a, open(resumed, "rb") as b:
+        assert a.read() == b.read()
+
+
+def test_checkpoint_for_another_job_is_ignored(tmp_path, pitches, monkeypatch):
+    output = str(tmp_path / "out.npy")
+    with monkeypatch.context() as patch:
+        interrupt_after(patch, 2)
+        with pytest.raises(Interrupted):
+            outofcore.run_memmap(pitches, output, TARGETS, chunk_size=500,
+                                 checkpoint_interval=0)
+    # Different targets: start over
+    assert outofcore.run_memmap(pitches, output, [46.0], chunk_size=500,
+                                checkpoint_interval=0) == 5000
+
+
+def test_no_checkpoint_always_starts_over(tmp_path, pitches, monkeypatch):
+    output = str(tmp_path / "out.npy")
+    with monkeypatch.context() as patch:
+        interrupt_after(patch, 2)
+        with pytest.raises(Interrupted):
+            outofcore.run_memmap(pitches, output, TARGETS, chunk_size=500,
+                                 checkpoint_interval=None)
+    assert not os.path.exists(outofcore.checkpoint_path(output))
+    assert outofcore.run_memmap(pitches, output, TARGETS, chunk_size=500,
+                                checkpoint_interval=None) == 5000
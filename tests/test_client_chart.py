@@ -0,0 +1,33 @@
+import os
+import shutil
+
+import plotly.offline
+import pytest
+
+from client_chart import (PLOTLY_JS_NAME, PLOTLY_JS_URL, render_html, verify,
+                          write_plotly_script)
+
+
+def test_component_loads_plotly_js_from_static_files():
+    page = render_html(60, 46.0)
+    assert f'<script src="{PLOTLY_JS_URL}"></script>' in page
+    assert PLOTLY_JS_URL.startswith("/app/static/")
+    # Only the config and client script are sent per render
+    assert len(page.encode()) < 50_000
+
+
+def test_plotly_js_is_written_once(tmp_path):
+    path = write_plotly_script.__wrapped__(str(tmp_path))
+    with open(path, encoding="utf-8") as f:
+        assert f.read() == plotly.offline.get_plotlyjs()
+    os.utime(path, (0, 0))
+    assert write_plotly_script.__wrapped__(str(tmp_path)) == path
+    assert os.path.getmtime(path) == 0
+    assert os.listdir(tmp_path) == [PLOTLY_JS_NAME]
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+def test_javascript_matches_python():
+    cases, mismatches = verify()
+    assert cases == 91 * 92
+    assert mismatches == 0
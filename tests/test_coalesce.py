@@ -0,0 +1,70 @@
+import asyncio
+import json
+
+import pytest
+
+import server
+from coalesce import Coalescer
+from utils import calculate_reaction_time
+
+
+def run_concurrently(coalescer, items):
+    async def main():
+        return await asyncio.gather(*(coalescer.submit(item) for item in items))
+    return asyncio.run(main())
+
+
+def test_concurrent_items_share_one_batch():
+    batches = []
+
+    def compute(items):
+        batches.append(list(items))
+        return [item * 2 for item in items]
+
+    coalescer = Coalescer(compute, max_delay=0.01)
+    assert run_concurrently(coalescer, range(10)) == [item * 2 for item in range(10)]
+    assert batches == [list(range(10))]
+    stats = coalescer.stats.snapshot()
+    assert stats["batches"] == 1 and stats["items"] == 10
+    assert stats["batch_size_buckets"] == {"<=16": 1}
+
+
+def test_max_batch_splits_batches():
+    coalescer = Coalescer(lambda items: items, max_delay=1.0, max_batch=4)
+    assert run_concurrently(coalescer, range(10)) == list(range(10))
+    stats = coalescer.stats.snapshot()
+    assert stats["batches"] == 3 and stats["max_batch_size"] == 4
+
+
+def test_errors_reach_every_caller_in_the_batch():
+    def compute(items):
+        raise ValueError("bad batch")
+
+    async def main():
+        coalescer = Coalescer(compute)
+        return await asyncio.gather(coalescer.submit(1), coalescer.submit(2),
+                                    return_exceptions=True)
+    assert [str(e) for e in asyncio.run(main())] == ["bad batch", "bad batch"]
+
+
+@pytest.mark.parametrize("coalesce", [True, False])
+def test_server_results_do_not_depend_on_coalescing(coalesce):
+    coalescers = server.make_coalescers() if coalesce else None
+
+    async def main():
+        bodies = [json.dumps({"speed": speed, "distance": 46}).encode()
+                  for speed in range(20, 111)]
+        return await asyncio.gather(*(server.dispatch("POST", "/reaction-time", body,
+                                                      coalescers)
+                                      for body in bodies))
+    responses = asyncio.run(main())
+    assert [json.loads(body)["reaction_time"] for _, body in responses] == [
+        calculate_reaction_time(float(speed), 46.0) for speed in range(20, 111)]
+
+    status, metrics = asyncio.run(server.dispatch("GET", "/metrics", b"", coalescers))
+    metrics = json.loads(metrics)
+    if coalesce:
+        assert metrics["reaction-time"]["items"] == 91
+        assert metrics["reaction-time"]["batches"] < 91
+    else:
+        assert metrics == {}
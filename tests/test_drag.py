@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from drag import calculate_drag_equivalent_speeds, calculate_flight_time
+from utils import calculate_reaction_time
+
+
+def test_drag_slows_every_pitch():
+    speeds = np.array([20.0, 45.0, 70.0, 110.0])
+    distances = np.array([15.0, 46.0, 54.0, 60.5])
+    flight = calculate_flight_time(speeds, distances)
+    constant = calculate_reaction_time(speeds, distances)
+    assert np.all(flight > constant)
+    assert np.all(flight < 1.3 * constant)
+
+
+def test_scalar_input_returns_float():
+    time = calculate_flight_time(60, 46.0)
+    assert isinstance(time, float)
+    assert time == calculate_flight_time(np.array([60.0]), np.array([46.0]))[0]
+
+
+def test_batch_matches_single_pitches():
+    speeds = np.array([[30.0, 60.0], [90.0, 110.0]])
+    distances = np.array([[20.0, 46.0], [54.0, 60.5]])
+    batch = calculate_flight_time(speeds, distances)
+    assert batch.shape == (2, 2)
+    for index in np.ndindex(batch.shape):
+        assert batch[index] == pytest.approx(
+            calculate_flight_time(speeds[index], distances[index]), rel=1e-12)
+
+
+def test_integrator_converges_with_more_steps():
+    coarse = calculate_flight_time(60, 46.0)
+    fine = calculate_flight_time(60, 46.0, steps=400)
+    assert coarse == pytest.approx(fine, abs=1e-9)
+
+
+def test_drag_equivalent_speeds_invert_flight_time():
+    target_time = calculate_flight_time(60, 46.0)
+    distances = np.array([20.0, 42.0, 46.0, 54.0])
+    speeds = calculate_drag_equivalent_speeds(target_time, distances)
+    np.testing.assert_allclose(calculate_flight_time(speeds, distances), target_time,
+                               rtol=1e-9)
+    assert speeds[2] == pytest.approx(60.0, rel=1e-8)
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from drag import calculate_flight_time
+from drag_table import ERROR_BOUND, FlightTimeTable, default_table
+
+
+@pytest.fixture(scope="module")
+def table():
+    return FlightTimeTable.build(error_bound=1e-6)
+
+
+def test_refined_table_is_within_its_bound(table):
+    assert table.max_error <= 1e-6
+    # Random points can fall a few times further from the check points
+    assert table.sampled_error(count=2000) <= 1e-5
+
+
+@pytest.mark.parametrize("method", ["linear", "cubic"])
+def test_table_reproduces_grid_nodes(method):
+    table = FlightTimeTable(np.linspace(20, 110, 10), np.linspace(15, 60.5, 10), method)
+    speed, distance = table.speeds[3], table.distances[7]
+    assert table.calculate_flight_time(speed, distance) == pytest.approx(
+        calculate_flight_time(speed, distance), rel=1e-12)
+
+
+def test_cubic_beats_linear_between_nodes():
+    speeds, distances = np.linspace(20, 110, 10), np.linspace(15, 60.5, 10)
+    linear = FlightTimeTable(speeds, distances, "linear").sampled_error(count=2000)
+    cubic = FlightTimeTable(speeds, distances, "cubic").sampled_error(count=2000)
+    assert cubic < linear
+
+
+def test_unknown_method_is_rejected():
+    with pytest.raises(ValueError):
+        FlightTimeTable([20, 110], [15, 60.5], method="spline")
+
+
+def test_default_table_meets_the_default_bound():
+    assert default_table().max_error <= ERROR_BOUND
+
+
+def test_running_out_of_rounds_warns():
+    with pytest.warns(RuntimeWarning, match="over the"):
+        table = FlightTimeTable.build(error_bound=1e-8, max_rounds=1)
+    assert table.max_error > 1e-8
@@ -0,0 +1,76 @@
+import io
+import sys
+
+import numpy as np
+import pytest
+
+import batch
+from export import pa, read_columns, write_columns
+from utils import calculate_reaction_time
+
+ROSTER = "player,speed,distance\nAvery,60,46\nBlake,x,46\nCasey,80,54\n"
+FORMATS = ["npy"] + (["arrow", "parquet"] if pa is not None else [])
+
+
+def convert(monkeypatch, path, targets, chunk_size=2):
+    monkeypatch.setattr(sys, "stdin", io.StringIO(ROSTER))
+    return batch.run_csv_columnar(["-"], str(path), targets, chunk_size)
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_columnar_export_matches_csv(tmp_path, monkeypatch, fmt):
+    path = tmp_path / f"out.{fmt}"
+    assert convert(monkeypatch, path, [42.0, 54.0]) == 3
+    columns = read_columns(str(path))
+    assert list(columns) == ["player", "speed", "distance", "reaction_time",
+                             "speed_at_42ft", "speed_at_54ft", "error_code"]
+    assert list(columns["player"]) == ["Avery", "Blake", "Casey"]
+    assert np.isnan(columns["speed"][1])
+    assert columns["reaction_time"][0] == calculate_reaction_time(60.0, 46.0)
+    assert np.isnan(columns["speed_at_42ft"][1])
+    assert columns["error_code"].tolist() == [0, 1, 0]
+
+    output = io.StringIO()
+    monkeypatch.setattr(sys, "stdin", io.StringIO(ROSTER))
+    batch.run_csv(["-"], output, [42.0, 54.0], 2)
+    csv_row = output.getvalue().splitlines()[3].split(",")
+    assert csv_row[4] == f"{columns['speed_at_42ft'][2]:.2f}"
+
+
+def test_overflowing_rows_get_the_out_of_range_code(tmp_path, monkeypatch):
+    path = tmp_path / "out.npy"
+    monkeypatch.setattr(sys, "stdin", io.StringIO("player,speed,distance\nTiny,1e-320,46\n"))
+    batch.run_csv_columnar(["-"], str(path), [42.0], 2)
+    columns = read_columns(str(path))
+    assert columns["error_code"].tolist() == [batch.OUT_OF_RANGE_CODE]
+    assert np.isnan(columns["reaction_time"][0])
+
+
+def test_parsed_columns_are_not_parsed_twice(tmp_path, monkeypatch):
+    calls = []
+    parse_floats = batch.parse_floats
+    monkeypatch.setattr(batch, "parse_floats",
+                        lambda values: calls.append(len(values)) or parse_floats(values))
+    convert(monkeypatch, tmp_path / "out.npy", [42.0], chunk_size=10)
+    assert calls == [3, 3]
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_write_and_read_round_trip(tmp_path, fmt):
+    columns = {"name": np.array(["a", "bb"]), "value": np.array([1.5, np.nan]),
+               "code": np.array([0, 3], dtype=np.uint8)}
+    path = str(tmp_path / f"table.{fmt}")
+    write_columns(path, columns)
+    loaded = read_columns(path)
+    assert list(loaded["name"]) == ["a", "bb"]
+    np.testing.assert_array_equal(loaded["value"], columns["value"])
+    assert loaded["code"].tolist() == [0, 3]
+
+
+def test_domain_table_covers_every_slider_combination():
+    columns = batch.domain_columns()
+    assert {values.size for values in columns.values()} == {91 * 92 * 92}
+    row = (60 - 20) * 92 * 92 + (46 * 2 - 30) * 92 + (42 * 2 - 30)
+    assert (columns["speed"][row], columns["distance"][row],
+            columns["target_distance"][row]) == (60.0, 46.0, 42.0)
+    assert columns["reaction_time"][row] == calculate_reaction_time(60.0, 46.0)
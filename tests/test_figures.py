@@ -0,0 +1,68 @@
+import json
+
+import numpy as np
+import plotly.graph_objects as go
+import pytest
+
+from figures import (FLOAT32_TOLERANCE, FRAME_BUDGET, _animated_spec, animated_figure_dict,
+                     build_animated_figure, build_figure, decode_typed_array,
+                     figure_dict, typed_array)
+from utils import (PRESET_DISTANCES, calculate_equivalent_speeds,
+                   calculate_reaction_time, generate_distance_range)
+
+
+def chart_args(speed=60, distance=46.0):
+    time = calculate_reaction_time(speed, distance)
+    distances = generate_distance_range()
+    return (speed, distance, distances, calculate_equivalent_speeds(time, distances),
+            calculate_equivalent_speeds(time, np.array(PRESET_DISTANCES)))
+
+
+def test_build_figure_is_the_validated_figure_dict():
+    fig = build_figure(*chart_args(), binary=False)
+    assert fig.to_dict() == go.Figure(figure_dict(*chart_args(), binary=False)).to_dict()
+    assert fig.layout.title.text == "Equivalent Speeds for 60 mph at 46.0 ft"
+
+
+def test_build_animated_figure_validates_frames():
+    fig = build_animated_figure(60, 46.0, axis="distance")
+    assert len(fig.frames) == len(fig.layout.sliders[0].steps)
+
+
+def test_typed_arrays_round_trip():
+    values = generate_distance_range()
+    spec = typed_array(values)
+    assert spec["dtype"] == "f4"
+    assert np.max(np.abs(decode_typed_array(spec) - values)) <= FLOAT32_TOLERANCE
+    precise = values + 1e-3 / 3
+    np.testing.assert_array_equal(decode_typed_array(typed_array(precise, "f8")), precise)
+
+
+@pytest.mark.parametrize("axis", ["speed", "distance"])
+@pytest.mark.parametrize("budget", [FRAME_BUDGET, FRAME_BUDGET // 5, 30_000])
+def test_animated_figure_fits_the_budget(axis, budget):
+    spec = animated_figure_dict(60, 46.0, axis, budget)
+    assert len(json.dumps(spec)) <= budget
+    names = [frame["name"] for frame in spec["frames"]]
+    assert ("60" if axis == "speed" else "46.0") in names
+
+
+def test_unreachable_budget_is_rejected():
+    with pytest.raises(ValueError, match="over the 1000 byte budget"):
+        animated_figure_dict(60, 46.0, "speed", budget=1000)
+
+
+def test_tightest_budget_keeps_only_the_current_frame():
+    budget = len(json.dumps(_animated_spec("speed", np.array([60]), 60, 46.0, True))) + 100
+    spec = animated_figure_dict(60, 46.0, "speed", budget)
+    assert len(json.dumps(spec)) <= budget
+    assert [frame["name"] for frame in spec["frames"]] == ["60"]
+
+
+def test_frames_show_their_reaction_time():
+    spec = animated_figure_dict(60, 46.0, "speed")
+    for frame in spec["frames"]:
+        (readout,) = frame["layout"]["annotations"]
+        time = calculate_reaction_time(int(frame["name"]), 46.0)
+        assert readout["text"] == f"⏱️ Reaction Time: {time:.3f} seconds"
+    assert spec["layout"]["annotations"][0]["text"].endswith("0.523 seconds")
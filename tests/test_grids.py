@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from utils import (PRESET_DISTANCES, generate_distance_range, get_distance_grid,
+                   get_distance_points, get_refined_distance_grid)
+
+GRIDS = [get_distance_grid, get_refined_distance_grid, get_distance_points,
+         generate_distance_range]
+
+
+def test_default_grid_covers_the_slider():
+    grid = generate_distance_range()
+    assert grid.size == 92
+    assert grid[0] == 15.0 and grid[-1] == 60.5
+    np.testing.assert_array_equal(np.diff(grid), 0.5)
+
+
+def test_grids_are_cached():
+    assert get_distance_grid() is get_distance_grid(15, 60.5, 0.5)
+    assert get_distance_grid(dtype=np.float32) is not get_distance_grid()
+    assert get_distance_grid(dtype=np.float32).dtype == np.float32
+
+
+@pytest.mark.parametrize("grid", GRIDS)
+def test_cached_grids_cannot_be_made_writeable(grid):
+    array = grid()
+    with pytest.raises(ValueError):
+        array[0] = 999.0
+    for candidate in (array, array.base, array[1:]):
+        with pytest.raises(ValueError):
+            candidate.flags.writeable = True
+    assert grid()[0] != 999.0
+
+
+def test_refined_grid_is_dense_near_anchors():
+    grid = get_refined_distance_grid(coarse_step=2.0, fine_step=0.25, radius=1.0)
+    assert grid[0] == 15.0 and grid[-1] == 60.5
+    for anchor in PRESET_DISTANCES:
+        near = grid[np.abs(grid - anchor) <= 1.0]
+        np.testing.assert_array_equal(np.diff(near), 0.25)
+    assert np.all(np.diff(grid) > 0)
@@ -0,0 +1,34 @@
+import numpy as np
+
+from utils import (calculate_equivalency_matrix, calculate_equivalent_speeds,
+                   calculate_reaction_time, generate_distance_range)
+
+
+def test_matrix_rows_match_scalar_functions():
+    speeds = np.array([20, 45, 60, 87, 110], dtype=float)
+    distances = np.array([15.0, 20.5, 46.0, 54.0, 60.5])
+    targets = generate_distance_range()
+    matrix = calculate_equivalency_matrix(speeds, distances, targets)
+    assert matrix.shape == (speeds.size, targets.size)
+    for row, speed, distance in zip(matrix, speeds, distances):
+        expected = calculate_equivalent_speeds(calculate_reaction_time(speed, distance),
+                                               targets)
+        np.testing.assert_array_equal(row, expected)
+
+
+def test_matrix_writes_into_out_buffers():
+    speeds, distances, targets = [60, 80], [46.0, 54.0], [42.0, 46.0, 54.0]
+    out = np.empty((2, 3))
+    times = np.empty(2)
+    result = calculate_equivalency_matrix(speeds, distances, targets, out=out,
+                                          times_out=times)
+    assert result is out
+    np.testing.assert_array_equal(times, calculate_reaction_time(np.array(speeds),
+                                                                 np.array(distances)))
+    np.testing.assert_array_equal(out, calculate_equivalency_matrix(speeds, distances,
+                                                                    targets))
+
+
+def test_matrix_of_input_distance_returns_input_speed():
+    matrix = calculate_equivalency_matrix([60.0], [46.0], [46.0])
+    assert np.isclose(matrix[0, 0], 60.0, rtol=1e-12)
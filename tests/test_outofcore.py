@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+import outofcore
+from utils import calculate_equivalency_matrix, validate_arrays
+
+TARGETS = [42.0, 46.0, 54.0]
+
+
+def make_pitches(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    pitches = np.column_stack([rng.uniform(0, 120, rows), rng.uniform(10, 65, rows)])
+    pitches[::17, 0] = np.nan
+    return pitches
+
+
+def check_output(out, pitches):
+    speeds, distances = pitches[:, 0], pitches[:, 1]
+    valid, codes = validate_arrays(speeds, distances)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        expected = calculate_equivalency_matrix(speeds, distances, TARGETS)
+    np.testing.assert_array_equal(out["error_code"], codes)
+    for j, target in enumerate(TARGETS):
+        column = out[outofcore.target_field(target)]
+        np.testing.assert_array_equal(column[valid], expected[valid, j])
+        assert np.isnan(column[~valid]).all()
+    assert np.isnan(out["reaction_time"][~valid]).all()
+
+
+@pytest.mark.parametrize("layout", ["columns", "structured", "raw"])
+def test_memmap_matches_in_memory_computation(tmp_path, layout):
+    pitches = make_pitches(1000)
+    input_path, raw_dtype = str(tmp_path / "pitches.npy"), None
+    if layout == "columns":
+        np.save(input_path, pitches)
+    elif layout == "structured":
+        records = np.empty(len(pitches), dtype=[("speed", "f8"), ("distance", "f8")])
+        records["speed"], records["distance"] = pitches[:, 0], pitches[:, 1]
+        np.save(input_path, records)
+    else:
+        input_path, raw_dtype = str(tmp_path / "pitches.bin"), "float32"
+        pitches = pitches.astype(np.float32)
+        pitches.tofile(input_path)
+        pitches = pitches.astype(float)
+
+    output_path = str(tmp_path / "out.npy")
+    rows = outofcore.run_memmap(input_path, output_path, TARGETS, chunk_size=128,
+                                raw_dtype=raw_dtype)
+    assert rows == 1000
+    check_output(np.load(output_path), pitches)
+
+
+def test_unsupported_input_shape_is_rejected(tmp_path):
+    path = str(tmp_path / "pitches.npy")
+    np.save(path, np.zeros((10, 3)))
+    with pytest.raises(ValueError, match="speed/distance"):
+        outofcore.run_memmap(path, str(tmp_path / "out.npy"), TARGETS)
@@ -0,0 +1,58 @@
+import os
+
+import numpy as np
+import pytest
+
+from parallel import ParallelEngine
+from utils import calculate_equivalency_matrix, validate_arrays
+
+TARGETS = [20.0, 42.0, 46.0, 54.0]
+
+
+@pytest.fixture(scope="module")
+def engine():
+    with ParallelEngine(workers=2) as engine:
+        yield engine
+
+
+def make_batch(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    speeds = rng.uniform(-10, 120, rows)
+    distances = rng.uniform(10, 65, rows)
+    speeds[::13] = np.nan
+    return speeds, distances
+
+
+@pytest.mark.parametrize("rows, shard_size", [(10_000, 999), (10_000, None), (1, 1)])
+def test_parallel_matches_serial_bit_for_bit(engine, rows, shard_size):
+    speeds, distances = make_batch(rows)
+    valid, codes = validate_arrays(speeds, distances)
+    times = np.empty(rows)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        matrix = calculate_equivalency_matrix(speeds, distances, TARGETS,
+                                              times_out=times)
+    with engine.run(speeds, distances, TARGETS, shard_size=shard_size) as result:
+        np.testing.assert_array_equal(result.valid, valid)
+        np.testing.assert_array_equal(result.codes, codes)
+        assert result.reaction_times.tobytes() == times.tobytes()
+        assert result.equivalent_speeds.tobytes() == matrix.tobytes()
+
+
+def test_close_releases_the_result(engine):
+    speeds, distances = make_batch(100)
+    result = engine.run(speeds, distances, TARGETS)
+    codes = result.codes.copy()
+    result.close()
+    assert result.codes is None and result.valid is None
+    assert codes.shape == (100,)
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/maps"), reason="needs /proc")
+def test_idle_workers_do_not_keep_results_mapped(engine):
+    speeds, distances = make_batch(10_000)
+    with engine.run(speeds, distances, TARGETS, shard_size=999) as result:
+        names = [block.name for block in result._blocks.values()]
+    for pid in engine._pool._processes:
+        with open(f"/proc/{pid}/maps") as f:
+            maps = f.read()
+        assert not any(name in maps for name in names)
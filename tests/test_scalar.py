@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from utils import (calculate_equivalent_speeds, calculate_reaction_time,
+                   equivalent_speed, lookup_reaction_time, reaction_time)
+
+
+@pytest.mark.parametrize("speed, distance", [
+    (60, 46.0), (60.0, 46), (np.float64(60.0), 46.0), (np.int64(60), np.float32(46.0)),
+    (True, 46.0),
+])
+def test_scalars_return_floats(speed, distance):
+    time = reaction_time(speed, distance)
+    assert type(time) is float
+    assert time == calculate_reaction_time(float(speed), float(distance))
+    speed_back = equivalent_speed(time, distance)
+    assert type(speed_back) is float
+    assert speed_back == calculate_equivalent_speeds(time, float(distance))
+
+
+def test_arrays_stay_arrays():
+    speeds = [40, 60, 80]
+    times = reaction_time(speeds, 46.0)
+    assert isinstance(times, np.ndarray)
+    np.testing.assert_array_equal(times, calculate_reaction_time(np.array(speeds,
+                                                                          dtype=float),
+                                                                 46.0))
+    assert equivalent_speed(times, [42.0, 46.0, 54.0]).shape == (3,)
+
+
+def test_lookup_fallback_uses_the_fast_path():
+    assert type(lookup_reaction_time(60.5, 46.0)) is float
+    assert type(lookup_reaction_time(np.float64(60.5), 46.0)) is float
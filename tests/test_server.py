@@ -0,0 +1,118 @@
+import asyncio
+import json
+
+import pytest
+
+import server
+from utils import calculate_equivalent_speeds, calculate_reaction_time
+
+HUGE = "1" + "0" * 400
+
+
+def call(method, path, body=None, raw=None):
+    payload = raw.encode() if raw is not None else json.dumps(body or {}).encode()
+    status, response = asyncio.run(server.dispatch(method, path, payload))
+    return status, json.loads(response)
+
+
+def test_reaction_time():
+    status, response = call("POST", "/reaction-time", {"speed": 60, "distance": 46})
+    assert status == 200
+    assert response == {"reaction_time": calculate_reaction_time(60, 46)}
+
+
+def test_equivalent_speeds_from_target_time():
+    status, response = call("POST", "/equivalent-speeds",
+                            {"target_time": 0.5, "distances": [42, 46]})
+    assert status == 200
+    assert response["equivalent_speeds"] == [calculate_equivalent_speeds(0.5, 42.0),
+                                             calculate_equivalent_speeds(0.5, 46.0)]
+
+
+def test_equivalent_speeds_on_the_default_grid():
+    status, response = call("POST", "/equivalent-speeds", {"speed": 60, "distance": 46})
+    assert status == 200
+    assert len(response["distances"]) == len(response["equivalent_speeds"]) == 92
+
+
+def test_batch_marks_invalid_rows():
+    status, response = call("POST", "/batch", {"speeds": [60, -1, 1e-320],
+                                               "distances": [46, 46, 46],
+                                               "targets": [42]})
+    assert status == 200
+    assert response["valid"] == [True, False, False]
+    assert response["errors"] == [[], ["Speed must be a positive number"],
+                                  [server.RESULT_OUT_OF_RANGE]]
+    assert response["reaction_times"][1:] == [None, None]
+
+
+@pytest.mark.parametrize("path, raw", [
+    ("/reaction-time", '{"speed": %s, "distance": 46}' % HUGE),
+    ("/reaction-time", '{"speed": 1e999, "distance": 46}'),
+    ("/equivalent-speeds", '{"target_time": %s}' % HUGE),
+    ("/equivalent-speeds", '{"target_time": 1e999}'),
+    ("/equivalent-speeds", '{"target_time": 0.5, "distances": [42, 1e999]}'),
+    ("/batch", '{"speeds": [%s], "distances": [46]}' % HUGE),
+    ("/batch", '{"speeds": [60], "distances": [46], "targets": [1e999]}'),
+    ("/reaction-time", '{"speed": 1e-320, "distance": 46}'),
+    ("/equivalent-speeds", '{"target_time": 1e-320}'),
+    ("/reaction-time", "[1, 2]"),
+    ("/reaction-time", "{"),
+])
+def test_bad_numbers_get_a_400(path, raw):
+    status, response = call("POST", path, raw=raw)
+    assert status == 400
+    assert response["errors"]
+
+
+def test_validate_reports_overflow_as_invalid():
+    status, response = call("POST", "/validate", raw='{"speed": %s, "distance": 46}' % HUGE)
+    assert status == 200
+    assert response == {"valid": False, "errors": ["Speed must be a positive number"]}
+
+
+def test_unknown_routes_and_methods():
+    assert call("GET", "/nope")[0] == 404
+    assert call("GET", "/reaction-time")[0] == 405
+
+
+def test_handler_errors_get_a_500(monkeypatch, capsys):
+    def broken(body, coalescers):
+        raise RuntimeError("boom")
+    monkeypatch.setitem(server.ROUTES, "/health", ("GET", broken))
+    assert call("GET", "/health") == (500, {"errors": ["Internal server error"]})
+    assert "boom" in capsys.readouterr().err
+
+
+async def exchange(requests):
+    """Send raw requests on one connection and return the raw response"""
+    listener = await asyncio.start_server(server.handle_connection, "127.0.0.1", 0)
+    port = listener.sockets[0].getsockname()[1]
+    async with listener:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(requests)
+        await writer.drain()
+        response = await asyncio.wait_for(reader.read(), 5)
+        writer.close()
+    return response.decode()
+
+
+def test_keep_alive_connection():
+    body = b'{"speed": 60, "distance": 46}'
+    request = (b"POST /reaction-time HTTP/1.1\r\nContent-Length: %d\r\n\r\n%s"
+               % (len(body), body))
+    last = (b"GET /health HTTP/1.1\r\nConnection: close\r\n\r\n")
+    response = asyncio.run(exchange(request + request + last))
+    assert response.count("HTTP/1.1 200 OK") == 3
+    assert response.endswith('{"status": "ok"}')
+
+
+def test_oversized_header_gets_a_431():
+    request = b"GET /health HTTP/1.1\r\nX-Padding: " + b"a" * 100_000 + b"\r\n\r\n"
+    response = asyncio.run(exchange(request))
+    assert response.startswith("HTTP/1.1 431 Request Header Fields Too Large")
+
+
+def test_malformed_request_gets_a_400():
+    response = asyncio.run(exchange(b"garbage\r\n\r\n"))
+    assert response.startswith("HTTP/1.1 400 Bad Request")
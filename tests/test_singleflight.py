@@ -0,0 +1,81 @@
+import threading
+import time
+
+import pytest
+
+from singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    runs = []
+
+    def compute(value):
+        runs.append(value)
+        started.set()
+        release.wait(5)
+        return value * 2
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("k", compute, 21)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(flight.do("k", compute, 0)))
+                 for _ in range(4)]
+    for thread in followers:
+        thread.start()
+    while flight.stats()["saved"] < 4:
+        time.sleep(0.001)
+    release.set()
+    for thread in [leader] + followers:
+        thread.join(5)
+
+    assert results == [42] * 5
+    assert runs == [21]
+    assert flight.stats() == {"calls": 5, "executions": 1, "saved": 4, "in_flight": 0}
+
+
+def test_nothing_is_cached_after_completion():
+    flight = SingleFlight()
+    assert flight.do("k", lambda: 1) == 1
+    assert flight.do("k", lambda: 2) == 2
+    assert flight.stats()["executions"] == 2
+
+
+def test_errors_reach_waiters_and_are_not_kept():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def fail():
+        started.set()
+        release.wait(5)
+        raise ValueError("boom")
+
+    errors = []
+
+    def call():
+        try:
+            flight.do("k", fail)
+        except ValueError as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=call)]
+    threads[0].start()
+    started.wait(5)
+    threads.append(threading.Thread(target=call))
+    threads[1].start()
+    while flight.stats()["saved"] < 1:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert errors == ["boom", "boom"]
+    assert flight.do("k", lambda: "ok") == "ok"
+
+
+def test_different_keys_run_separately():
+    flight = SingleFlight()
+    assert [flight.do(key, lambda key=key: key) for key in "abc"] == ["a", "b", "c"]
+    with pytest.raises(KeyError):
+        flight.do("d", {}.__getitem__, "missing")
@@ -0,0 +1,31 @@
+import numpy as np
+
+from solver import solve_speeds
+from utils import calculate_equivalent_speeds, calculate_reaction_time
+
+
+def test_closed_form_is_inverted_exactly():
+    target_times = np.array([[0.3], [0.5]])
+    distances = np.array([20.0, 46.0, 60.5])
+    result = solve_speeds(calculate_reaction_time, target_times, distances)
+    assert result.speeds.shape == (2, 3)
+    assert result.converged.all()
+    np.testing.assert_allclose(result.speeds,
+                               calculate_equivalent_speeds(target_times, distances),
+                               rtol=1e-9)
+
+
+def test_bisection_recovers_from_a_bad_start():
+    result = solve_speeds(calculate_reaction_time, 0.5, np.array([46.0]),
+                          initial=499.0)
+    assert result.converged.all()
+    np.testing.assert_allclose(result.speeds, calculate_equivalent_speeds(0.5, 46.0),
+                               rtol=1e-9)
+
+
+def test_unreachable_targets_are_reported():
+    # Faster than UPPER_SPEED can fly
+    result = solve_speeds(calculate_reaction_time, 1e-4, np.array([46.0, 60.5]),
+                          max_iterations=20)
+    assert not result.converged.any()
+    assert (result.iterations == 20).all()
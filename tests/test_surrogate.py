@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+import surrogate_coefficients
+import utils
+from drag import calculate_drag_equivalent_speeds, calculate_flight_time
+from utils import (DISTANCE_MAX, DISTANCE_MIN, SPEED_MAX, SPEED_MIN,
+                   calculate_equivalent_speeds, calculate_reaction_time,
+                   calculate_surrogate_equivalent_speeds,
+                   calculate_surrogate_flight_time, generate_distance_range)
+
+
+def test_equivalent_speed_domain_covers_every_chart_curve():
+    (low, high), _ = surrogate_coefficients.EQUIVALENT_SPEED_DOMAIN
+    slowest = calculate_equivalent_speeds(
+        calculate_reaction_time(SPEED_MIN, DISTANCE_MAX), DISTANCE_MIN)
+    fastest = calculate_equivalent_speeds(
+        calculate_reaction_time(SPEED_MAX, DISTANCE_MIN), DISTANCE_MAX)
+    assert low <= slowest and fastest <= high
+
+
+def test_flight_time_surrogate_matches_drag_model():
+    rng = np.random.default_rng(0)
+    speeds = rng.uniform(SPEED_MIN, SPEED_MAX, 2000)
+    distances = rng.uniform(DISTANCE_MIN, DISTANCE_MAX, 2000)
+    np.testing.assert_allclose(calculate_surrogate_flight_time(speeds, distances),
+                               calculate_flight_time(speeds, distances), atol=1e-6)
+
+
+@pytest.mark.parametrize("speed, distance", [
+    (SPEED_MIN, DISTANCE_MAX), (SPEED_MAX, DISTANCE_MIN), (60, 46.0),
+])
+def test_equivalent_speed_surrogate_matches_drag_model(speed, distance):
+    target_time = calculate_flight_time(speed, distance)
+    distances = generate_distance_range()
+    np.testing.assert_allclose(
+        calculate_surrogate_equivalent_speeds(target_time, distances),
+        calculate_drag_equivalent_speeds(target_time, distances), atol=1e-3)
+
+
+@pytest.mark.parametrize("name, function, args", [
+    ("SURROGATE_FLIGHT_TIME", calculate_surrogate_flight_time, (60.0, 46.0)),
+    ("SURROGATE_EQUIVALENT_SPEED", calculate_surrogate_equivalent_speeds, (0.5, 46.0)),
+])
+def test_missing_coefficients_say_how_to_fit_them(monkeypatch, name, function, args):
+    monkeypatch.setattr(utils, "surrogate_coefficients", None)
+    monkeypatch.setattr(utils, name, None)
+    with pytest.raises(RuntimeError, match="run fit_surrogate.py"):
+        function(*args)
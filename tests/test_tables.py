@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from build_tables import build_tables, save_table
+from utils import (EQUIVALENT_SPEED_TABLE, REACTION_TIME_TABLE,
+                   calculate_equivalent_speeds, calculate_reaction_time,
+                   generate_distance_range, load_equivalency_tables,
+                   lookup_equivalent_speeds, lookup_reaction_time, table_index)
+
+
+def write_tables(directory, tables=None):
+    reaction_times, equivalent_speeds = tables or build_tables()
+    save_table(directory, REACTION_TIME_TABLE, reaction_times)
+    save_table(directory, EQUIVALENT_SPEED_TABLE, equivalent_speeds)
+
+
+def test_table_index_on_and_off_the_grid():
+    assert table_index(20, 15.0) == (0, 0)
+    assert table_index(110, 60.5) == (90, 91)
+    assert table_index(60.5, 46.0) is None
+    assert table_index(60, 46.25) is None
+    assert table_index(111, 46.0) is None
+    assert table_index(60, 14.5) is None
+
+
+@pytest.mark.parametrize("speed, distance", [
+    (float("nan"), 46.0), (60, float("nan")), (float("inf"), 46.0),
+    (60, float("-inf")), (10 ** 400, 46.0), (60, -10 ** 400),
+])
+def test_table_index_rejects_non_finite_input(speed, distance):
+    assert table_index(speed, distance) is None
+
+
+def test_tables_match_computed_values():
+    reaction_times, equivalent_speeds = build_tables()
+    i, j = table_index(60, 46.0)
+    assert reaction_times[i, j] == calculate_reaction_time(60.0, 46.0)
+    np.testing.assert_array_equal(
+        equivalent_speeds[i, j],
+        calculate_equivalent_speeds(calculate_reaction_time(60.0, 46.0),
+                                    generate_distance_range()))
+
+
+def test_missing_tables_are_not_cached(tmp_path):
+    assert load_equivalency_tables(str(tmp_path)) is None
+    write_tables(tmp_path)
+    tables = load_equivalency_tables(str(tmp_path))
+    assert tables is not None
+    assert tables[1].shape == (91, 92, 92)
+
+
+def test_tables_for_another_grid_are_ignored(tmp_path):
+    reaction_times, equivalent_speeds = build_tables()
+    write_tables(tmp_path, (reaction_times[:, :-1], equivalent_speeds[:, :-1, :-1]))
+    assert load_equivalency_tables(str(tmp_path)) is None
+
+
+def test_lookups_fall_back_off_the_grid():
+    assert lookup_reaction_time(60.5, 46.0) == calculate_reaction_time(60.5, 46.0)
+    np.testing.assert_array_equal(
+        lookup_equivalent_speeds(60.5, 46.0),
+        calculate_equivalent_speeds(calculate_reaction_time(60.5, 46.0),
+                                    generate_distance_range()))
+    assert np.isnan(lookup_reaction_time(float("nan"), 46.0))
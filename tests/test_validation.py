@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from utils import (ERROR_MESSAGES, INVALID_DISTANCE, INVALID_SPEED, error_messages,
+                   validate_arrays, validate_inputs)
+
+SPEED_ERROR = ERROR_MESSAGES[INVALID_SPEED]
+DISTANCE_ERROR = ERROR_MESSAGES[INVALID_DISTANCE]
+
+
+def test_codes_combine_per_row():
+    speeds = [60, 0, 60, -5, np.nan, np.inf]
+    distances = [46.0, 46.0, 14.9, 61.0, np.nan, 46.0]
+    valid, codes = validate_arrays(speeds, distances)
+    assert valid.tolist() == [True, False, False, False, False, False]
+    assert codes.dtype == np.uint8
+    assert codes.tolist() == [0, INVALID_SPEED, INVALID_DISTANCE,
+                              INVALID_SPEED | INVALID_DISTANCE,
+                              INVALID_SPEED | INVALID_DISTANCE, INVALID_SPEED]
+
+
+def test_distance_bounds_are_inclusive():
+    valid, _ = validate_arrays([60, 60, 60, 60], [15.0, 60.5, 14.99, 60.51])
+    assert valid.tolist() == [True, True, False, False]
+
+
+def test_error_messages_follow_the_flags():
+    assert error_messages(0) == []
+    assert error_messages(INVALID_SPEED | INVALID_DISTANCE) == [SPEED_ERROR,
+                                                               DISTANCE_ERROR]
+
+
+@pytest.mark.parametrize("speed, distance, expected", [
+    (60, 46.0, []),
+    (60.5, 15, []),
+    (0, 46.0, [SPEED_ERROR]),
+    ("60", 46.0, [SPEED_ERROR]),
+    (None, None, [SPEED_ERROR, DISTANCE_ERROR]),
+    (60, 70.0, [DISTANCE_ERROR]),
+    (float("inf"), 46.0, [SPEED_ERROR]),
+    (float("nan"), 46.0, [SPEED_ERROR]),
+    (1e999, -1e999, [SPEED_ERROR, DISTANCE_ERROR]),
+    (10 ** 400, 46.0, [SPEED_ERROR]),
+    (60, 10 ** 400, [DISTANCE_ERROR]),
+])
+def test_validate_inputs(speed, distance, expected):
+    assert validate_inputs(speed, distance) == expected
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from utils import (EquivalencyWorkspace, calculate_equivalency_matrix,
+                   calculate_equivalent_speeds, calculate_reaction_time,
+                   generate_distance_range)
+
+
+def test_evaluate_matches_scalar_functions():
+    workspace = EquivalencyWorkspace()
+    time, speeds = workspace.evaluate(60, 46.0)
+    assert time == calculate_reaction_time(60, 46.0)
+    np.testing.assert_array_equal(
+        speeds, calculate_equivalent_speeds(time, generate_distance_range()))
+
+
+def test_results_are_read_only_views_reused_by_the_next_query():
+    workspace = EquivalencyWorkspace([42.0, 46.0])
+    _, first = workspace.evaluate(60, 46.0)
+    with pytest.raises(ValueError):
+        first[0] = 0.0
+    _, second = workspace.evaluate(80, 54.0)
+    assert np.shares_memory(first, second)
+    np.testing.assert_array_equal(first, second)
+
+
+def test_evaluate_batch_grows_and_matches_the_matrix():
+    targets = [20.0, 42.0, 46.0, 54.0]
+    workspace = EquivalencyWorkspace(targets, capacity=2)
+    speeds, distances = [40, 50, 60, 80, 95], [20.0, 42.0, 46.0, 54.0, 54.0]
+    times, matrix = workspace.evaluate_batch(speeds, distances)
+    assert workspace.capacity == 5
+    np.testing.assert_array_equal(
+        matrix, calculate_equivalency_matrix(speeds, distances, targets))
+    np.testing.assert_array_equal(
+        times, calculate_reaction_time(np.array(speeds, dtype=float),
+                                       np.array(distances)))
+
+    times, matrix = workspace.evaluate_batch(speeds[:3], distances[:3])
+    assert times.shape == (3,) and matrix.shape == (3, 4)
+    assert workspace.capacity == 5
@@ -1,4 +1,36 @@
+import numbers
+import os
+from functools import lru_cache
+
 import numpy as np
+from numpy.polynomial.chebyshev import chebval2d
+
+try:
+    import surrogate_coefficients
+except ImportError:  # fit_surrogate.py has not been run
+    surrogate_coefficients = None
+
+# Slider domain in main.py; every possible UI answer lies on this grid
+SPEED_MIN, SPEED_MAX, SPEED_STEP = 20, 110, 1
+DISTANCE_MIN, DISTANCE_MAX, DISTANCE_STEP = 15.0, 60.5, 0.5
+SPEED_COUNT = int((SPEED_MAX - SPEED_MIN) / SPEED_STEP) + 1
+DISTANCE_COUNT = int((DISTANCE_MAX - DISTANCE_MIN) / DISTANCE_STEP) + 1
+
+# Validation error codes from validate_arrays; bit flags, so they combine
+INVALID_SPEED = 1
+INVALID_DISTANCE = 2
+ERROR_MESSAGES = {
+    INVALID_SPEED: "Speed must be a positive number",
+    INVALID_DISTANCE: "Distance must be between 15 and 60.5 feet",
+}
+
+# Preset distances marked on the chart (BP, 10U, 12U, HS/Pro)
+PRESET_DISTANCES = (20.0, 42.0, 46.0, 54.0)
+
+# Written by build_tables.py, memory-mapped at runtime
+TABLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tables")
+REACTION_TIME_TABLE = "reaction_times.npy"
+EQUIVALENT_SPEED_TABLE = "equivalent_speeds.npy"
 
 def calculate_reaction_time(speed, distance):
     """Calculate reaction time given speed (mph) and distance (ft)"""
@@ -11,18 +43,302 @@ def calculate_equivalent_speeds(target_time, distances):
     # Convert back to mph from ft/s
     return (distances / target_time) / 1.467
 
+# Types that take the pure-Python path in reaction_time/equivalent_speed
+_PYTHON_SCALARS = (int, float)
+
+def _as_scalar_or_array(value):
+    if type(value) in _PYTHON_SCALARS:
+        return value
+    if isinstance(value, (numbers.Real, np.generic)):
+        return float(value)
+    return np.asarray(value, dtype=float)
+
+def reaction_time(speed, distance):
+    """Reaction time for one speed (mph) and distance (ft), or elementwise for arrays
+
+    Python and NumPy scalars (bools included) are computed with plain float
+    arithmetic and return a float; anything else is converted to an array.
+    """
+    if type(speed) not in _PYTHON_SCALARS or type(distance) not in _PYTHON_SCALARS:
+        speed, distance = _as_scalar_or_array(speed), _as_scalar_or_array(distance)
+    return calculate_reaction_time(speed, distance)
+
+def equivalent_speed(target_time, distance):
+    """Equivalent speed (mph) at one distance, or elementwise for arrays
+
+    Python and NumPy scalars (bools included) are computed with plain float
+    arithmetic and return a float; anything else is converted to an array.
+    """
+    if type(target_time) not in _PYTHON_SCALARS or type(distance) not in _PYTHON_SCALARS:
+        target_time = _as_scalar_or_array(target_time)
+        distance = _as_scalar_or_array(distance)
+    return calculate_equivalent_speeds(target_time, distance)
+
+def calculate_equivalency_matrix(speeds, distances, target_distances,
+                                 out=None, times_out=None):
+    """Calculate equivalent speeds for many (speed, distance) inputs at once
+
+    Row i of the result equals
+    calculate_equivalent_speeds(calculate_reaction_time(speeds[i], distances[i]),
+    target_distances). Pass preallocated arrays as out (shape
+    (len(speeds), len(target_distances))) and times_out (shape (len(speeds),))
+    to avoid allocating on every call; times_out receives the reaction times.
+    """
+    speeds = np.asarray(speeds, dtype=float)
+    distances = np.asarray(distances, dtype=float)
+    target_distances = np.asarray(target_distances, dtype=float)
+
+    # Same operation order as the scalar functions so results match exactly
+    times = np.multiply(speeds, 1.467, out=times_out)
+    np.divide(distances, times, out=times)
+    out = np.divide(target_distances, times[:, np.newaxis], out=out)
+    return np.divide(out, 1.467, out=out)
+
+def _read_only(array):
+    view = array.view()
+    view.flags.writeable = False
+    return view
+
+def _freeze(array):
+    # Backed by immutable bytes, so neither the array nor any view of it can
+    # be made writeable again
+    return np.frombuffer(array.tobytes(), dtype=array.dtype).reshape(array.shape)
+
+@lru_cache(maxsize=64)
+def _uniform_grid(start, stop, step, dtype):
+    count = int(np.floor((stop - start) / step + 1e-9)) + 1
+    return _freeze((start + step * np.arange(count)).astype(dtype))
+
+def get_distance_grid(start=DISTANCE_MIN, stop=DISTANCE_MAX, step=DISTANCE_STEP,
+                      dtype=float):
+    """Cached, read-only distance grid from start to stop in step increments
+
+    stop is included when it falls on a step. Grids are shared between
+    callers and keyed on (start, stop, step, dtype), so repeated calls cost
+    a dictionary lookup instead of an allocation.
+    """
+    return _uniform_grid(float(start), float(stop), float(step), np.dtype(dtype).str)
+
+@lru_cache(maxsize=64)
+def _refined_grid(anchors, start, stop, coarse_step, fine_step, radius, dtype):
+    offsets = fine_step * np.arange(-round(radius / fine_step),
+                                    round(radius / fine_step) + 1)
+    fine = (np.array(anchors)[:, np.newaxis] + offsets).ravel()
+    fine = fine[(fine >= start) & (fine <= stop)]
+    coarse = _uniform_grid(start, stop, coarse_step, np.dtype(float).str)
+    grid = np.union1d(np.union1d(coarse, fine), [start, stop])
+    return _freeze(grid.astype(dtype))
+
+def get_refined_distance_grid(anchors=PRESET_DISTANCES, coarse_step=2.0,
+                              fine_step=0.25, radius=1.0, start=DISTANCE_MIN,
+                              stop=DISTANCE_MAX, dtype=float):
+    """Cached, read-only non-uniform grid, dense within radius of each anchor distance
+
+    Points are coarse_step apart away from the anchors and fine_step apart
+    near them, so callers can trade resolution for point count.
+    """
+    return _refined_grid(tuple(float(a) for a in anchors), float(start),
+                         float(stop), float(coarse_step), float(fine_step),
+                         float(radius), np.dtype(dtype).str)
+
+@lru_cache(maxsize=64)
+def _points_grid(points, dtype):
+    return _freeze(np.array(points, dtype=dtype))
+
+def get_distance_points(points=PRESET_DISTANCES, dtype=float):
+    """Cached, read-only array of specific distances, e.g. the chart reference points"""
+    return _points_grid(tuple(float(p) for p in points), np.dtype(dtype).str)
+
 def generate_distance_range():
-    """Generate distance range from 15ft to 60.5ft in 0.5ft increments"""
-    return np.arange(15, 61, 0.5)
+    """Generate distance range from 15ft to 60.5ft in 0.5ft increments
+
+    The array is cached and read-only; copy it before modifying.
+    """
+    return get_distance_grid()
+
+def validate_arrays(speeds, distances):
+    """Validate whole columns of speeds and distances in one pass
+
+    Returns (valid, codes): a boolean mask and uint8 error codes, the OR of
+    the INVALID_* flags that apply to each row (0 when valid). NaN and
+    infinite values fail both checks, so unparseable values can be passed as
+    NaN. Use error_messages to turn a code into the messages the UI shows.
+    """
+    speeds = np.asarray(speeds, dtype=float)
+    distances = np.asarray(distances, dtype=float)
+    bad_speed = ~((speeds > 0) & np.isfinite(speeds))
+    bad_distance = ~((distances >= DISTANCE_MIN) & (distances <= DISTANCE_MAX))
+    codes = (bad_speed.astype(np.uint8) * INVALID_SPEED
+             | bad_distance.astype(np.uint8) * INVALID_DISTANCE)
+    return codes == 0, codes
+
+def error_messages(code):
+    """Messages for an error code from validate_arrays"""
+    return [message for flag, message in ERROR_MESSAGES.items() if code & flag]
+
+def _real_or_nan(value):
+    # Non-numbers and ints too large for a float become NaN, which fails validation
+    if isinstance(value, numbers.Real):
+        try:
+            return float(value)
+        except OverflowError:
+            pass
+    return np.nan
 
 def validate_inputs(speed, distance):
     """Validate user inputs"""
-    errors = []
-    
-    if not isinstance(speed, (int, float)) or speed <= 0:
-        errors.append("Speed must be a positive number")
-    
-    if not isinstance(distance, (int, float)) or distance < 15 or distance > 60.5:
-        errors.append("Distance must be between 15 and 60.5 feet")
-        
-    return errors
+    code = validate_arrays(_real_or_nan(speed), _real_or_nan(distance))[1]
+    return error_messages(int(code))
+
+class EquivalencyWorkspace:
+    """Reusable grid and output buffers for repeated equivalency evaluation
+
+    Results are computed in place with ufunc out= calls and returned as
+    read-only views of the workspace buffers, so a query allocates nothing.
+    The views are overwritten by the next query: copy them to keep them. A
+    workspace is not thread-safe; give each worker its own.
+    """
+
+    def __init__(self, distances=None, capacity=1):
+        if distances is None:
+            distances = generate_distance_range()
+        self._distances = np.array(distances, dtype=float)
+        self.distances = _read_only(self._distances)
+        self._speeds = np.empty(self._distances.size)
+        self.speeds = _read_only(self._speeds)
+        self._allocate_batch(capacity)
+
+    def _allocate_batch(self, capacity):
+        self.capacity = capacity
+        self._batch_times = np.empty(capacity)
+        self._batch_speeds = np.empty((capacity, self._distances.size))
+
+    def equivalent_speeds(self, target_time):
+        """Equivalent speeds over the workspace grid, as a read-only view"""
+        # Same operations as calculate_equivalent_speeds, written in place
+        np.divide(self._distances, target_time, out=self._speeds)
+        np.divide(self._speeds, 1.467, out=self._speeds)
+        return self.speeds
+
+    def evaluate(self, speed, distance):
+        """Return (reaction_time, equivalent speeds view) for one input"""
+        reaction_time = calculate_reaction_time(speed, distance)
+        return reaction_time, self.equivalent_speeds(reaction_time)
+
+    def evaluate_batch(self, speeds, distances):
+        """Return read-only (reaction_times, equivalency matrix) views for a batch
+
+        Buffers grow to the largest batch seen and are reused after that.
+        """
+        count = len(speeds)
+        if count > self.capacity:
+            self._allocate_batch(count)
+        times = self._batch_times[:count]
+        matrix = self._batch_speeds[:count]
+        calculate_equivalency_matrix(speeds, distances, self._distances,
+                                     out=matrix, times_out=times)
+        return _read_only(times), _read_only(matrix)
+
+def table_speeds():
+    """Speeds (mph) covered by the precomputed tables"""
+    return np.arange(SPEED_MIN, SPEED_MAX + SPEED_STEP, SPEED_STEP, dtype=float)
+
+def table_index(speed, distance):
+    """Return the (speed, distance) table indices, or None if off the grid"""
+    try:
+        i = (speed - SPEED_MIN) / SPEED_STEP
+        j = (distance - DISTANCE_MIN) / DISTANCE_STEP
+    except OverflowError:  # Python ints too large for a float
+        return None
+    if not (np.isfinite(i) and np.isfinite(j)) or i != int(i) or j != int(j):
+        return None
+    i, j = int(i), int(j)
+    if not (0 <= i < SPEED_COUNT and 0 <= j < DISTANCE_COUNT):
+        return None
+    return i, j
+
+def quantize_inputs(speed, distance):
+    """Snap (speed, distance) to the slider steps as (int, float) cache keys"""
+    speed = SPEED_MIN + round((speed - SPEED_MIN) / SPEED_STEP) * SPEED_STEP
+    distance = DISTANCE_MIN + round((distance - DISTANCE_MIN) / DISTANCE_STEP) * DISTANCE_STEP
+    return int(speed), float(distance)
+
+@lru_cache(maxsize=1)
+def _map_tables(directory):
+    tables = (np.load(os.path.join(directory, REACTION_TIME_TABLE), mmap_mode="r"),
+              np.load(os.path.join(directory, EQUIVALENT_SPEED_TABLE), mmap_mode="r"))
+    shape = (SPEED_COUNT, get_distance_grid().size)
+    if tables[0].shape != shape or tables[1].shape != shape + shape[1:]:
+        raise ValueError(f"Tables in {directory} do not match the slider grid, "
+                         "rerun build_tables.py")
+    return tables
+
+def load_equivalency_tables(directory=TABLE_DIR):
+    """Memory-map the precomputed tables, or return None if they are not usable
+
+    Returns (reaction_times, equivalent_speeds) with shapes (speeds, distances)
+    and (speeds, distances, distances). The maps are read-only, so every
+    process shares the same OS page cache. Missing tables, or tables built
+    for a different grid, are not cached, so running build_tables.py takes
+    effect on the next call.
+    """
+    try:
+        return _map_tables(directory)
+    except (FileNotFoundError, ValueError):
+        return None
+
+def lookup_reaction_time(speed, distance):
+    """Reaction time from the precomputed table, computed if not available"""
+    tables = load_equivalency_tables()
+    index = table_index(speed, distance)
+    if tables is None or index is None:
+        return reaction_time(speed, distance)
+    return float(tables[0][index])
+
+def lookup_equivalent_speeds(speed, distance):
+    """Equivalent speeds over generate_distance_range() for a (speed, distance) input
+
+    Served from the precomputed table when available, computed otherwise.
+    """
+    tables = load_equivalency_tables()
+    index = table_index(speed, distance)
+    if tables is None or index is None:
+        return calculate_equivalent_speeds(calculate_reaction_time(speed, distance),
+                                           generate_distance_range())
+    return tables[1][index]
+
+def _chebyshev_series(name):
+    if surrogate_coefficients is None:
+        return None
+    return np.array(getattr(surrogate_coefficients, name))
+
+# Loaded once at import; see fit_surrogate.py
+SURROGATE_FLIGHT_TIME = _chebyshev_series("FLIGHT_TIME_COEFFICIENTS")
+SURROGATE_EQUIVALENT_SPEED = _chebyshev_series("EQUIVALENT_SPEED_COEFFICIENTS")
+
+def _evaluate_surrogate(coefficients, domain_name, x, y):
+    if coefficients is None:
+        raise RuntimeError("Surrogate coefficients missing, run fit_surrogate.py")
+    (x0, x1), (y0, y1) = getattr(surrogate_coefficients, domain_name)
+    return chebval2d((2 * x - (x0 + x1)) / (x1 - x0),
+                     (2 * y - (y0 + y1)) / (y1 - y0), coefficients)
+
+def calculate_surrogate_flight_time(speed, distance):
+    """Calculate flight time with air drag from the fitted Chebyshev surrogate
+
+    Fitted over the slider domain (20-110 mph, 15-60.5 ft).
+    """
+    ratio = _evaluate_surrogate(SURROGATE_FLIGHT_TIME, "FLIGHT_TIME_DOMAIN",
+                                speed, distance)
+    return ratio * calculate_reaction_time(speed, distance)
+
+def calculate_surrogate_equivalent_speeds(target_time, distances):
+    """Calculate equivalent speeds with air drag from the fitted Chebyshev surrogate
+
+    Fitted for equivalent speeds of 4-450 mph at 15-60.5 ft, which covers
+    every curve the chart can show.
+    """
+    constant_speeds = calculate_equivalent_speeds(target_time, distances)
+    ratio = _evaluate_surrogate(SURROGATE_EQUIVALENT_SPEED, "EQUIVALENT_SPEED_DOMAIN",
+                                constant_speeds, distances)
+    return ratio * constant_speeds